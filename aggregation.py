@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+STATUSES = ['출석', '지각', '결석']
+KEYS = ['부서', '이름', '날짜', '출석상태']
+
+
+class AttendanceAggregates:
+    # (부서, 이름, 날짜, 출석상태)별 건수를 한 번의 groupby로 계산하고
+    # 회원/부서/날짜별 통계는 모두 이 결과를 다시 묶어서 만든다
+    def __init__(self, df):
+        self.counts = df.groupby(KEYS, sort=False, observed=True).size()
+
+    def filtered_counts(self, department=None, until_date=None, name=None):
+        counts = self.counts
+        if department is None and until_date is None and name is None:
+            return counts
+
+        mask = np.ones(len(counts), dtype=bool)
+        if department is not None:
+            mask &= counts.index.get_level_values('부서') == department
+        if name is not None:
+            mask &= counts.index.get_level_values('이름') == name
+        if until_date is not None:
+            mask &= counts.index.get_level_values('날짜') <= until_date
+        return counts[mask]
+
+    def table(self, level, department=None, until_date=None, name=None):
+        counts = self.filtered_counts(department, until_date, name)
+        if len(counts) == 0:
+            return pd.DataFrame(index=pd.Index([], name=level))
+        return counts.groupby(level=[level, '출석상태'], observed=True).sum().unstack(fill_value=0)
+
+    def totals(self, department=None, until_date=None, name=None):
+        counts = self.filtered_counts(department, until_date, name)
+        return status_counts(counts.groupby(level='출석상태', observed=True).sum())
+
+
+def status_counts(row):
+    # 출석/지각/결석 건수와 전체 건수(기타 상태 포함)를 파이썬 int로 돌려준다
+    counts = {status: int(row.get(status, 0)) for status in STATUSES}
+    counts['합계'] = int(row.sum())
+    return counts
+
+
+def table_rows(table):
+    # 행마다 status_counts와 같은 딕셔너리 (iterrows 없이 한 번에 변환)
+    if len(table) == 0:
+        return {}
+    counts = table.reindex(columns=STATUSES, fill_value=0)
+    counts['합계'] = table.sum(axis=1)
+    return counts.astype('int64').to_dict('index')
@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+from aggregation import STATUSES
+from clubs import DEFAULT_CLUB, get_club_directory, get_system
+
+MAX_BODY = 64 * 1024
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def json_default(value):
+    # numpy 정수/실수는 파이썬 값으로 바꾼다
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def parse_date(value):
+    if not value:
+        return None
+    try:
+        # '2025-1-5'도 받되 저장소의 (날짜, 이름) 키와 같도록 0을 채워 돌려준다
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise ApiError(400, "날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+
+def parse_status(value):
+    if value not in STATUSES:
+        raise ApiError(400, f"출석 상태는 {', '.join(STATUSES)} 중 하나여야 합니다.")
+    return value
+
+
+def parse_names(value):
+    # "홍길동, 김철수" 같은 문자열이나 이름 목록
+    if isinstance(value, list) and all(isinstance(name, str) for name in value):
+        return ' '.join(value)
+    if isinstance(value, str):
+        return value
+    raise ApiError(400, "names는 문자열이나 문자열 목록이어야 합니다.")
+
+
+class CheckInBatcher:
+    # 동시에 들어온 출석 체크 요청을 모아 한 번에 기록한다
+    # 기록하는 동안 쌓인 요청이 다음 묶음이 되므로 한가할 때는 기다리지 않고, 몰릴 때만 묶인다
+    def __init__(self, system, executor, max_batch=500):
+        self.system = system
+        self.executor = executor
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.task = None
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, names, status, date):
+        loop = asyncio.get_running_loop()
+        if self.task is None:
+            self.task = loop.create_task(self.run())
+        future = loop.create_future()
+        await self.queue.put((names, status, date, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            requests = [(names, status, date) for names, status, date, _ in batch]
+            try:
+                outcomes = await loop.run_in_executor(self.executor, self.system.record_attendance_batch, requests)
+            except Exception as error:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            for (*_, future), outcome in zip(batch, outcomes):
+                # 응답을 기다리던 연결이 끊겼으면 건너뛴다
+                if not future.done():
+                    future.set_result(outcome)
+
+
+class AttendanceApi:
+    # 키오스크/스크립트용 HTTP API (표준 라이브러리 asyncio만 사용)
+    # 동아리별 AttendanceSystem은 clubs.get_system으로 얻으므로 화면과 같은 프로세스에서 띄우면 저장소와 캐시를 함께 쓴다
+    def __init__(self, directory=None):
+        self.directory = directory or get_club_directory()
+        # 쓰기는 한 스레드에서 차례로, 읽기는 여러 스레드에서 처리한다
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api-writer')
+        self.readers = ThreadPoolExecutor(max_workers=4, thread_name_prefix='api-reader')
+        self.batchers = {}
+        self.server = None
+        # 열린 연결: writer -> 처리 중인 태스크
+        self.connections = {}
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/check-in'): self.check_in,
+            ('POST', '/modify'): self.modify,
+            ('GET', '/summary'): self.summary,
+        }
+
+    async def system(self, params):
+        club_id = params.get('club') or DEFAULT_CLUB
+        club = self.directory.get(club_id)
+        if club is None:
+            raise ApiError(404, f"{club_id} 동아리가 없습니다.")
+        # 처음 만들 때는 파일을 읽으므로 이벤트 루프 밖에서 만든다
+        return await asyncio.get_running_loop().run_in_executor(self.readers, get_system, club)
+
+    async def health(self, params):
+        return 200, {'status': 'ok'}
+
+    async def check_in(self, params):
+        names = parse_names(params.get('names'))
+        status = parse_status(params.get('status') or '출석')
+        date = parse_date(params.get('date'))
+        system = await self.system(params)
+        batcher = self.batchers.get(id(system))
+        if batcher is None:
+            batcher = self.batchers[id(system)] = CheckInBatcher(system, self.writer)
+        results, recorded = await batcher.submit(names, status, date)
+        return 200, {'results': results, 'recorded': recorded}
+
+    async def modify(self, params):
+        date = parse_date(params.get('date'))
+        name = params.get('name')
+        if not date or not isinstance(name, str) or not name:
+            raise ApiError(400, "date와 name이 필요합니다.")
+        status = parse_status(params.get('status'))
+        system = await self.system(params)
+        success, message = await asyncio.get_running_loop().run_in_executor(
+            self.writer, system.modify_attendance, date, name, status, params.get('editor') or '')
+        return (200 if success else 404), {'success': success, 'message': message}
+
+    async def summary(self, params):
+        system = await self.system(params)
+        summary, error = await asyncio.get_running_loop().run_in_executor(
+            self.readers, system.get_attendance_summary, params.get('name') or None, params.get('department') or None)
+        if error:
+            return 404, {'error': error}
+        return 200, {'summary': summary}
+
+    def stats(self):
+        return {
+            'batches': sum(batcher.batches for batcher in self.batchers.values()),
+            'requests': sum(batcher.requests for batcher in self.batchers.values()),
+        }
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        try:
+            if handler is None:
+                if any(path == url.path for _, path in self.routes):
+                    raise ApiError(405, "허용되지 않는 메서드입니다.")
+                raise ApiError(404, "없는 주소입니다.")
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if body:
+                try:
+                    data = json.loads(body.decode('utf-8'))
+                except (UnicodeDecodeError, ValueError):
+                    raise ApiError(400, "JSON 본문을 읽을 수 없습니다.")
+                if not isinstance(data, dict):
+                    raise ApiError(400, "JSON 본문은 객체여야 합니다.")
+                params.update(data)
+            return await handler(params)
+        except ApiError as error:
+            return error.status, {'error': str(error)}
+        except Exception as error:
+            return 500, {'error': str(error)}
+
+    async def respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False, default=json_default).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + data)
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        # 연결 하나에서 여러 요청을 차례로 처리한다 (HTTP/1.1 keep-alive)
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                parts = request_line.decode('utf-8', 'replace').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                if len(parts) != 3:
+                    await self.respond(writer, 400, {'error': "잘못된 요청입니다."}, False)
+                    break
+                method, target, version = parts
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    await self.respond(writer, 413, {'error': "본문이 너무 큽니다."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self.dispatch(method, target, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765):
+        # port가 0이면 빈 포트를 골라 그 번호를 돌려준다
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=256)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # 대기 중인 keep-alive 연결도 닫고 처리 태스크가 끝날 때까지 기다린다
+            tasks = list(self.connections.values())
+            for writer in list(self.connections):
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.server.wait_closed()
+        self.writer.shutdown(wait=False)
+        self.readers.shutdown(wait=False)
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def start_background_server(host='127.0.0.1', port=8765):
+    # Streamlit과 같은 프로세스의 별도 스레드에서 API를 띄운다 (주소마다 한 번)
+    key = (host, port)
+    with _servers_lock:
+        if key in _servers:
+            return _servers[key]
+        ready = threading.Event()
+        state = {}
+
+        def run():
+            loop = asyncio.new_event_loop()
+            api = AttendanceApi()
+            try:
+                state['port'] = loop.run_until_complete(api.start(host, port))
+            except OSError as error:
+                state['error'] = error
+                ready.set()
+                return
+            state['api'] = api
+            ready.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name=f'attendance-api-{port}', daemon=True).start()
+        ready.wait()
+        if 'error' in state:
+            raise state['error']
+        _servers[key] = state
+        return state
+
+
+async def serve(host, port):
+    api = AttendanceApi()
+    port = await api.start(host, port)
+    print(f"출결 API 실행 중: http://{host}:{port}")
+    async with api.server:
+        await api.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='출결 관리 HTTP API')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드할 주소')
+    parser.add_argument('--port', type=int, default=8765, help='포트')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,339 @@
+from datetime import datetime
+import os
+import pandas as pd
+from storage import create_storage
+from transfer import WRITERS, export_chunks, export_to_bytes
+from repository import get_repository
+from aggregation import STATUSES
+from counters import status_snapshot
+from ingest import plan_bulk_insert, plan_import, plan_migration
+from members import ClubMembers, split_names
+from clubs import DEFAULT_CLUB, get_club_directory
+from query_cache import get_query_cache
+from layout import public_columns
+from prediction import get_predictor, expected_headcount
+from matrix import at_risk_members
+from profiling import profile_methods
+from timeseries import MAX_POINTS
+from reports import REPORTS_FILE, get_report_snapshots
+
+@profile_methods
+class AttendanceSystem(ClubMembers):
+    def __init__(self, club=None):
+        # 동아리마다 데이터/회원 파일과 부서 목록이 따로 있다 (없으면 현재 폴더의 기본 동아리)
+        super().__init__(club or get_club_directory().get(DEFAULT_CLUB))
+        self.data_file = self.club.path('attendance_data.db')
+        # 엑셀/CSV는 가져오기·내보내기 용도로만 사용
+        self.import_files = [self.club.path('attendance_data.xlsx'), self.club.path('attendance_data.csv')]
+        self.storage = create_storage(self.data_file)
+        self.records = get_repository(self.storage)
+        # 조회 결과와 차트 캐시 (데이터나 동아리원 목록이 바뀌면 자동으로 무효화)
+        self.cache = get_query_cache(self.records, self.member_registry)
+        # 최종 연습 일자별 통계의 연습일별 스냅샷 (파일로 저장하고 바뀐 날짜 이후만 다시 계산)
+        self.reports = get_report_snapshots(self.records, self.club.path(REPORTS_FILE))
+        self.initialize_data_file()
+
+    def initialize_data_file(self):
+        if not self.storage.exists():
+            self.storage.initialize()
+            for path in self.import_files:
+                if os.path.exists(path):
+                    self.storage.import_file(path, plan=plan_migration)
+                    break
+        else:
+            self.storage.initialize()
+
+    def export_data(self, path):
+        fmt = os.path.splitext(path)[1].lstrip('.')
+        if fmt not in WRITERS:
+            self.storage.export_file(path)
+            return
+        with open(path, 'wb') as f:
+            export_chunks(self.storage.iter_chunks(), fmt, f)
+
+    def export_attendance(self, fmt, date=None, name=None, department=None, start_date=None, end_date=None):
+        # 저장소에서 청크 단위로 읽어 바로 파일 형식으로 쓴다
+        chunks = self.storage.iter_chunks(date, name, department, start_date, end_date)
+        return export_to_bytes(chunks, fmt)
+
+    def plan_import(self, chunk):
+        return plan_import(chunk, self.get_members_list(), self.departments)
+
+    def import_attendance(self, source):
+        read, inserted, rejected = self.storage.import_file(source, plan=self.plan_import)
+        # 캐시된 데이터는 다음 조회 때 다시 읽는다
+        self.records.invalidate()
+        if read == 0:
+            return False, "가져올 출석 기록이 없습니다."
+        skipped = sum(rejected.values())
+        message = f"{read}건 중 {inserted}건을 가져왔습니다. (이미 있는 기록 {read - inserted - skipped}건 제외)"
+        if skipped:
+            reasons = ', '.join(f"{reason} {count}건" for reason, count in rejected.items())
+            message += f"\n가져오지 않은 행 {skipped}건: {reasons}"
+        return True, message
+
+    def compact_data(self):
+        return self.records.compact()
+
+    def check_attendance(self, names, status='출석', date=None):
+        results, _ = self.record_attendance(names, status, date)
+        return "\n".join(results)
+
+    def record_attendance(self, names, status='출석', date=None):
+        # 결과 메시지 목록과 새로 기록한 이름 목록 (출석 체크 화면의 확인 음성/영상에 쓴다)
+        return self.record_attendance_batch([(names, status, date)])[0]
+
+    def record_attendance_batch(self, requests):
+        # 여러 출석 체크 요청 [(이름들, 상태, 날짜)]을 차례로 검증한 뒤 한 번에 기록한다
+        # 이미 있는 기록은 묶음 전체에 대해 한 번만 찾고, 앞 요청이 기록한 이름은 뒤 요청에서 이미 기록된 것으로 본다
+        valid_members = self.get_members_list()
+        today = datetime.now().strftime('%Y-%m-%d')
+        planned = []
+        keys = []
+        for names, status, date in requests:
+            # 목록에 없는 이름은 한 자모 오타면 보정하고, 아니면 후보만 알려준 뒤 나머지는 그대로 기록한다
+            resolved = self.resolve_names(split_names(names))
+            date = date or today
+            planned.append((resolved, status, date))
+            keys.extend((date, item['이름']) for item in resolved if item['이름'] is not None)
+        recorded = set(self.records.existing_keys(keys)) if keys else set()
+        outcomes, new_records = self.plan_batch(planned, valid_members, recorded)
+        inserted = self.records.insert_records(new_records)
+        if len(inserted) != len(new_records):
+            # 검증과 기록 사이에 다른 곳에서 먼저 기록한 이름은 이미 기록된 것으로 안내한다
+            landed = {(record['날짜'], record['이름']) for record in inserted}
+            recorded = set(self.records.existing_keys(keys)) - landed
+            outcomes, _ = self.plan_batch(planned, valid_members, recorded)
+        return outcomes
+
+    def plan_batch(self, planned, valid_members, recorded):
+        outcomes = []
+        new_records = []
+        for resolved, status, date in planned:
+            results, records = self.plan_check_in(resolved, status, date, valid_members, recorded)
+            outcomes.append((results, [record['이름'] for record in records]))
+            new_records.extend(records)
+        return outcomes, new_records
+
+    def plan_check_in(self, resolved, status, date, valid_members, recorded):
+        if not resolved:
+            return ["입력된 이름이 없습니다."], []
+        
+        results = []
+        new_records = []
+        for item in resolved:
+            name = item['이름']
+            if name is None:
+                message = f"{item['입력']}님은 동아리원 목록에 없습니다."
+                if item['후보']:
+                    message += f" (혹시: {', '.join(item['후보'])})"
+                results.append(message)
+                continue
+            if item['방식'] == '자동 보정':
+                results.append(f"'{item['입력']}'을(를) {name}님으로 보정했습니다.")
+            if (date, name) in recorded:
+                results.append(f"{name}님은 이미 {date} 출석 기록이 있습니다.")
+                continue
+            
+            new_records.append({
+                '날짜': date,
+                '이름': name,
+                '부서': valid_members[name],
+                '출석상태': status,
+                '비고': ''
+            })
+            recorded.add((date, name))
+            results.append(f"{name}님의 출석이 기록되었습니다. (날짜: {date}, 상태: {status})")
+        
+        return results, new_records
+
+    def bulk_check_attendance(self, rows):
+        # 여러 행을 한 번에 검증하고 한 번에 기록한 뒤 행별 결과를 돌려준다
+        report, new_records = plan_bulk_insert(rows, self.get_members_list(), self.records)
+        inserted = self.records.insert_records(new_records)
+        if len(inserted) != len(new_records):
+            landed = {(record['날짜'], record['이름']) for record in inserted}
+            keys = pd.Series(list(zip(report['날짜'], report['이름'])), index=report.index)
+            report.loc[(report['결과'] == '기록됨') & ~keys.isin(landed), '결과'] = '이미 출석 기록이 있음'
+        return report
+
+    def get_attendance_summary(self, name=None, department=None):
+        return self.cache.get('get_attendance_summary', {'name': name, 'department': department},
+                              lambda: self.compute_attendance_summary(name, department))
+
+    def compute_attendance_summary(self, name=None, department=None):
+        members = self.get_members_list()
+        aggregates = self.records.aggregates()
+        
+        if name:
+            if name not in members:
+                return None, f"{name}님은 동아리원 목록에 없습니다."
+            counts = aggregates.totals(name=name)
+        elif department:
+            if department not in self.departments:
+                return None, f"존재하지 않는 부서입니다."
+            counters = self.records.counters()
+            counts = status_snapshot(counters.departments.get(department, {}))
+        else:
+            counts = aggregates.totals()
+        
+        if counts['합계'] == 0:
+            return None, "출석 기록이 없습니다."
+        
+        if name:
+            total_days = counts['합계']
+            attendance_count = counts['출석']
+            late_count = counts['지각']
+            absent_count = counts['결석']
+            
+            attendance_rate = (attendance_count / total_days) * 100 if total_days > 0 else 0
+            
+            summary = {
+                '이름': name,
+                '부서': members[name],
+                '총_활동일수': total_days,
+                '출석': attendance_count,
+                '지각': late_count,
+                '결석': absent_count,
+                '출석률': attendance_rate
+            }
+            
+            return summary, None
+        else:
+            member_stats = counters.department_members(department)
+            summary = []
+            for dept_member in self.get_department_members(department):
+                stats = member_stats.get(dept_member)
+                if stats:
+                    total_days = stats['합계']
+                    attendance_count = stats['출석']
+                    late_count = stats['지각']
+                    absent_count = stats['결석']
+                    attendance_rate = (attendance_count / total_days) * 100 if total_days > 0 else 0
+                    
+                    summary.append({
+                        '이름': dept_member,
+                        '출석': attendance_count,
+                        '지각': late_count,
+                        '결석': absent_count,
+                        '출석률': attendance_rate
+                    })
+            
+            return summary, None
+
+    def get_total_statistics(self):
+        return self.cache.get('get_total_statistics', {}, self.compute_total_statistics)
+
+    def compute_total_statistics(self):
+        counters = self.records.counters()
+        total = status_snapshot(counters.total)
+        
+        if total['합계'] == 0:
+            return None, "출석 기록이 없습니다."
+        
+        # 부서별 통계
+        dept_stats = {}
+        for dept in self.departments:
+            stats = counters.departments.get(dept, {})
+            dept_stats[dept] = {status: stats.get(status, 0) for status in STATUSES}
+        
+        # 날짜별 통계
+        date_stats = counters.date_table()
+        
+        return {
+            '전체': {status: total[status] for status in STATUSES},
+            '부서별': dept_stats,
+            '날짜별': date_stats
+        }, None
+
+    def view_attendance(self, date=None):
+        return self.cache.get('view_attendance', {'date': date or None},
+                              lambda: self.records.load(date=date or None))
+
+    def get_practice_count(self, start_date=None, end_date=None):
+        return self.cache.get('get_practice_count', {'start_date': start_date, 'end_date': end_date},
+                              lambda: self.compute_practice_count(start_date, end_date))
+
+    def compute_practice_count(self, start_date=None, end_date=None):
+        if start_date and end_date:
+            df = self.records.select(start_date=start_date, end_date=end_date)
+        else:
+            df = self.records.select()
+        
+        # 날짜별 출석 인원 수 계산
+        daily_count = public_columns(df.groupby('날짜').size().reset_index(name='출석인원'))
+        
+        # 부서별 출석 인원 수 계산
+        dept_count = df.groupby(['날짜', '부서'], observed=True).size().reset_index(name='출석인원')
+        dept_count = public_columns(dept_count).sort_values(['날짜', '부서']).reset_index(drop=True)
+        
+        return daily_count, dept_count
+
+    def get_attendance_trend(self, start_date=None, end_date=None, department=None, by_department=False,
+                             resolution=None, max_points=MAX_POINTS):
+        # 기간별(일/주/월) 출석 추이와 이동 출석률 -> (표, 단위)
+        # resolution을 주지 않으면 범위의 점 개수가 max_points 이하가 되는 가장 촘촘한 단위를 고른다
+        params = {'start_date': start_date, 'end_date': end_date, 'department': department,
+                  'by_department': by_department, 'resolution': resolution, 'max_points': max_points}
+        return self.cache.get('get_attendance_trend', params, lambda: self.compute_attendance_trend(**params))
+
+    def compute_attendance_trend(self, start_date=None, end_date=None, department=None, by_department=False,
+                                 resolution=None, max_points=MAX_POINTS):
+        with self.records.lock:
+            return self.records.rollups().series(resolution, start_date, end_date, department, by_department,
+                                                 max_points)
+
+    def modify_attendance(self, date, name, new_status, editor=''):
+        # 해당 날짜와 이름의 출석 상태 수정 (이전/새 상태와 시각을 이력에 남긴다)
+        if self.records.update_status(date, name, new_status, editor) == 0:
+            return False, f"{date}에 {name}님의 출석 기록이 없습니다."
+        
+        return True, f"{name}님의 {date} 출석 상태가 {new_status}로 수정되었습니다."
+
+    def get_change_history(self, date=None, name=None, limit=None):
+        return self.storage.change_history(date=date, name=name, limit=limit)
+
+    def undo_attendance_changes(self, count=1, editor=''):
+        undone = self.records.undo_changes(count, editor)
+        if not undone:
+            return False, "되돌릴 수정 기록이 없습니다."
+        lines = [f"{change['이름']}님의 {change['날짜']} 출석 상태를 {change['이전상태']}로 되돌렸습니다." for change in undone]
+        return True, "\n".join(lines)
+
+    def view_attendance_as_of(self, timestamp, date=None):
+        # timestamp('YYYY-MM-DD HH:MM:SS') 시점의 출석 기록
+        return self.storage.load_as_of(timestamp, date=date or None)
+
+    def predict_attendance(self, target_date):
+        # 다음 연습(target_date)의 회원별 출석 확률과 부서별 예상 인원
+        forecast = get_predictor(self.records).forecast(target_date, self.get_members_list())
+        return forecast, expected_headcount(forecast, self.departments)
+
+    def get_at_risk_members(self, window=5, min_missed=3, department=None, top=None):
+        # 회원 × 연습일 행렬에서 최근 window회 중 min_missed회 이상 빠진 동아리원
+        params = {'window': window, 'min_missed': min_missed, 'department': department, 'top': top}
+        return self.cache.get('get_at_risk_members', params, lambda: self.compute_at_risk_members(**params))
+
+    def compute_at_risk_members(self, window=5, min_missed=3, department=None, top=None):
+        members = self.get_members_list()
+        with self.records.lock:
+            return at_risk_members(self.records.matrix(), members, window, min_missed, department, top)
+
+    def get_summary_until_date(self, until_date, department=None):
+        return self.cache.get('get_summary_until_date', {'until_date': until_date, 'department': department},
+                              lambda: self.compute_summary_until_date(until_date, department))
+
+    def compute_summary_until_date(self, until_date, department=None):
+        members = self.get_members_list()
+        
+        if department:
+            filtered_members = self.get_department_members(department)
+        else:
+            filtered_members = list(members.keys())
+        
+        # until_date 이전의 마지막 연습일 스냅샷에서 바로 만든다 (원본 기록은 다시 집계하지 않음)
+        return self.reports.summary_until_date(until_date, filtered_members, members, department or None)
+
+    def get_report_dates(self):
+        # 스냅샷이 있는 보고서 날짜 (연습일, 월말)
+        return self.reports.report_dates()
@@ -0,0 +1,335 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+DEPARTMENTS = ['락킹', '왁킹', '힙합', '걸스힙합', '하우스', '브레이킹']
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+
+def practice_dates(count, end=date(2025, 6, 28)):
+    # 수요일/토요일 연습일을 end부터 거꾸로 count개
+    dates = []
+    day = end
+    while len(dates) < count:
+        if day.weekday() in (2, 5):
+            dates.append(day.strftime('%Y-%m-%d'))
+        day -= timedelta(days=1)
+    return dates[::-1]
+
+
+def generate_members(count, seed=0):
+    rng = np.random.default_rng(seed)
+    departments = rng.choice(DEPARTMENTS, size=count)
+    return {f'회원{i:05d}': dept for i, dept in enumerate(departments)}
+
+
+def generate_records(members, total, seed=0):
+    # 회원마다 출석 성향을 다르게 주고 (날짜, 이름)이 겹치지 않게 만든다
+    rng = np.random.default_rng(seed)
+    names = np.array(list(members.keys()))
+    departments = np.array(list(members.values()))
+    attend_rate = rng.beta(5, 2, size=len(names))
+    dates_needed = max(1, int(np.ceil(total / (attend_rate.mean() * len(names)))))
+    dates = np.array(practice_dates(dates_needed))
+
+    present = rng.random((len(dates), len(names))) < attend_rate
+    date_idx, name_idx = np.nonzero(present)
+    date_idx, name_idx = date_idx[:total], name_idx[:total]
+    status = rng.choice(['출석', '지각', '결석'], size=len(date_idx), p=[0.85, 0.1, 0.05])
+    return pd.DataFrame({
+        '날짜': dates[date_idx],
+        '이름': names[name_idx],
+        '부서': departments[name_idx],
+        '출석상태': status,
+        '비고': '',
+    })
+
+
+def build_dataset(directory, records, members_count, seed=0):
+    from storage import create_storage
+
+    members = generate_members(members_count, seed)
+    df = generate_records(members, records, seed)
+    with open(os.path.join(directory, 'members_list.txt'), 'w', encoding='utf-8') as f:
+        f.write(''.join(f"{name},{dept}\n" for name, dept in members.items()))
+    storage = create_storage(os.path.join(directory, 'attendance_data.db'))
+    storage.initialize()
+    storage.insert(df.to_dict('records'))
+    return members, df
+
+
+def measure(func, repeat, setup=None):
+    # setup은 매 호출 전에 시간 밖에서 실행한다
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+    }
+
+
+def measure_memory(func, setup=None):
+    # tracemalloc은 실행을 느리게 하므로 시간 측정과 따로 한 번 더 실행한다
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+# 콜드 스타트: 구간마다 새 프로세스를 띄워 잰다
+# streamlit은 서버가 이미 불러온 상태이므로 시간에서 뺀다
+STARTUP_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+import streamlit
+start = time.perf_counter()
+stage = {stage!r}
+import app
+from views import load_page
+from views.context import PageContext
+from clubs import get_club_directory
+if stage in ('check_in_page', 'member_page', 'summary_page'):
+    load_page({{'check_in_page': '출석 체크', 'member_page': '동아리원 관리', 'summary_page': '출석 현황 조회'}}[stage])
+elif stage == 'first_check_in':
+    load_page('출석 체크')
+    PageContext(get_club_directory().get(), []).get_system().check_attendance({names!r}, '출석', '2030-01-01')
+print(json.dumps({{'ms': (time.perf_counter() - start) * 1000, 'pandas': 'pandas' in sys.modules}}))
+"""
+STARTUP_STAGES = ['app', 'check_in_page', 'member_page', 'summary_page', 'first_check_in']
+
+
+def measure_startup(directory, names, repeat):
+    root = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for stage in STARTUP_STAGES:
+        timings = []
+        for _ in range(repeat):
+            script = STARTUP_SCRIPT.format(root=root, stage=stage, names=' '.join(names))
+            output = subprocess.run([sys.executable, '-c', script], cwd=directory, capture_output=True,
+                                    text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            timings.append(result['ms'])
+        results[stage] = {'median_ms': statistics.median(timings), 'min_ms': min(timings), 'pandas': result['pandas']}
+    return results
+
+
+async def api_request(port, path, payload):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    writer.write(f'POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Length: {len(body)}\r\n'
+                 f'Connection: close\r\n\r\n'.encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b' ', 2)[1])
+
+
+async def api_burst(names, count):
+    # 로컬 서버를 띄우고 count명이 한꺼번에 출석 체크하는 상황을 만든다
+    from api import AttendanceApi
+
+    api = AttendanceApi()
+    port = await api.start('127.0.0.1', 0)
+    try:
+        await api_request(port, '/check-in', {'names': names[0], 'date': '2040-01-01'})
+
+        async def check_in(name):
+            start = time.perf_counter()
+            status = await api_request(port, '/check-in', {'names': name, 'date': '2040-01-02'})
+            return (time.perf_counter() - start) * 1000, status
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[check_in(name) for name in names[1:count + 1]])
+        total_ms = (time.perf_counter() - start) * 1000
+        stats = api.stats()
+    finally:
+        await api.close()
+    timings = sorted(ms for ms, _ in results)
+    return {
+        'requests': len(results),
+        'errors': sum(status != 200 for _, status in results),
+        'total_ms': total_ms,
+        'median_ms': statistics.median(timings),
+        'p95_ms': timings[int(len(timings) * 0.95) - 1],
+        'batches': stats['batches'] - 1,
+    }
+
+
+def operations(system, members, df):
+    names = list(members.keys())
+    departments = system.departments
+    last_date = df['날짜'].max()
+    middle_date = df['날짜'].iloc[len(df) // 2]
+    first_date = df['날짜'].min()
+    counter = {'n': 0}
+
+    def next_date():
+        # 매 반복마다 새 날짜에 기록해서 중복 검사에 걸리지 않게 한다
+        counter['n'] += 1
+        return (date(2030, 1, 1) + timedelta(days=counter['n'])).strftime('%Y-%m-%d')
+
+    def bulk_rows():
+        day = next_date()
+        return pd.DataFrame({'날짜': day, '이름': names[:200], '출석상태': '출석'})
+
+    sample = df.iloc[len(df) // 3]
+    return {
+        'get_members_list': lambda: system.get_members_list(),
+        'check_attendance': lambda: system.check_attendance(' '.join(names[:10]), '출석', next_date()),
+        'bulk_check_attendance': lambda: system.bulk_check_attendance(bulk_rows()),
+        'modify_attendance': lambda: system.modify_attendance(sample['날짜'], sample['이름'], '지각'),
+        'view_attendance': lambda: system.view_attendance(last_date),
+        'get_attendance_summary_name': lambda: system.get_attendance_summary(name=names[0]),
+        'get_attendance_summary_department': lambda: system.get_attendance_summary(department=departments[0]),
+        'get_total_statistics': lambda: system.get_total_statistics(),
+        'get_summary_until_date': lambda: system.get_summary_until_date(middle_date),
+        'get_practice_count': lambda: system.get_practice_count(first_date, middle_date),
+        'get_attendance_trend': lambda: system.get_attendance_trend(),
+        'predict_attendance': lambda: system.predict_attendance(last_date),
+        'get_at_risk_members': lambda: system.get_at_risk_members(),
+    }
+
+
+def run_size(label, records, members_count, repeat, seed=0, startup_repeat=3, burst=100):
+    directory = tempfile.mkdtemp(prefix=f'attendance_bench_{label}_')
+    cwd = os.getcwd()
+    build_start = time.perf_counter()
+    members, df = build_dataset(directory, records, members_count, seed)
+    build_ms = (time.perf_counter() - build_start) * 1000
+    # 다른 측정보다 먼저 재야 데이터 파일이 캐시되지 않은 배포 직후와 비슷하다
+    startup = measure_startup(directory, list(members)[:10], startup_repeat) if startup_repeat else {}
+
+    os.chdir(directory)
+    try:
+        from attendance import AttendanceSystem
+
+        system = AttendanceSystem()
+        results = {}
+        for name, func in operations(system, members, df).items():
+            # 첫 호출은 캐시를 비운 상태에서 따로 잰다
+            system.records.invalidate()
+            cold = measure(func, 1)
+            # 반복 측정은 조회 결과 캐시를 매번 비워서 실제 계산 시간을 잰다 (캐시 적중 시간은 따로 기록)
+            stats = measure(func, repeat, setup=system.cache.clear)
+            stats['cold_ms'] = cold['median_ms']
+            stats['cached_ms'] = measure(func, repeat)['median_ms']
+            stats['peak_kb'] = measure_memory(func, setup=system.cache.clear)
+            results[name] = stats
+        api = asyncio.run(api_burst(list(members), burst)) if burst else {}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        'records': len(df),
+        'members': members_count,
+        'build_ms': build_ms,
+        'startup': startup,
+        'api_burst': api,
+        'operations': results,
+    }
+
+
+def compare(report, baseline, max_regression, slack_ms):
+    # 기준 보고서보다 max_regression배 + slack_ms 이상 느려진 항목
+    regressions = []
+    for label, result in report['sizes'].items():
+        base = baseline.get('sizes', {}).get(label)
+        if not base:
+            continue
+        for name, stats in result['operations'].items():
+            base_stats = base['operations'].get(name)
+            if not base_stats:
+                continue
+            limit = base_stats['median_ms'] * max_regression + slack_ms
+            if stats['median_ms'] > limit:
+                regressions.append({
+                    'size': label,
+                    'operation': name,
+                    'baseline_ms': base_stats['median_ms'],
+                    'median_ms': stats['median_ms'],
+                    'limit_ms': limit,
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='출결 관리 시스템 성능 측정')
+    parser.add_argument('--sizes', default='10k,100k', help='측정할 크기 (10k,100k,1m 또는 숫자)')
+    parser.add_argument('--members', type=int, default=2000, help='합성 동아리원 수')
+    parser.add_argument('--repeat', type=int, default=5, help='연산별 반복 횟수')
+    parser.add_argument('--startup-repeat', type=int, default=3, help='콜드 스타트 구간별 반복 횟수 (0이면 생략)')
+    parser.add_argument('--api-burst', type=int, default=100, help='HTTP API로 동시에 보낼 출석 체크 수 (0이면 생략)')
+    parser.add_argument('--output', default='benchmark_report.json', help='결과 JSON 파일')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--max-regression', type=float, default=1.25, help='허용하는 최대 배율')
+    parser.add_argument('--slack-ms', type=float, default=2.0, help='작은 값의 흔들림을 무시할 여유(ms)')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    report = {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'sizes': {},
+    }
+    for label in args.sizes.split(','):
+        label = label.strip()
+        records = SIZES.get(label) or int(label)
+        print(f'[{label}] {records}건, 동아리원 {args.members}명 측정 중...')
+        result = run_size(label, records, args.members, args.repeat, startup_repeat=args.startup_repeat,
+                          burst=args.api_burst)
+        report['sizes'][label] = result
+        for stage, stats in result['startup'].items():
+            print(f"  시작 {stage:31s} {stats['median_ms']:10.2f} ms  (pandas {'로드' if stats['pandas'] else '안 함'})")
+        if result['api_burst']:
+            burst = result['api_burst']
+            print(f"  API 동시 출석 체크 {burst['requests']}건: 전체 {burst['total_ms']:.1f} ms, "
+                  f"중앙값 {burst['median_ms']:.1f} ms, p95 {burst['p95_ms']:.1f} ms, "
+                  f"쓰기 {burst['batches']}번, 실패 {burst['errors']}건")
+        for name, stats in result['operations'].items():
+            print(f"  {name:36s} {stats['median_ms']:10.2f} ms  (첫 호출 {stats['cold_ms']:.2f} ms, "
+                  f"캐시 적중 {stats['cached_ms']:.2f} ms, 최대 메모리 {stats['peak_kb']:.0f} KB)")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['regressions'] = compare(report, baseline, args.max_regression, args.slack_ms)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f'결과 저장: {args.output}')
+
+    if report.get('regressions'):
+        for item in report['regressions']:
+            print(f"성능 저하: [{item['size']}] {item['operation']} "
+                  f"{item['baseline_ms']:.2f} ms -> {item['median_ms']:.2f} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import json
+import os
+import re
+import threading
+
+from fileutil import atomic_write
+from members import ClubMembers
+from profiling import STARTUP
+
+DEFAULT_CLUB = 'default'
+DEFAULT_DEPARTMENTS = ['락킹', '왁킹', '힙합', '걸스힙합', '하우스', '브레이킹']
+CLUBS_FILE = 'clubs.json'
+CLUBS_DIR = 'clubs'
+DATA_FILE = 'attendance_data.db'
+MEMBERS_FILE = 'members_list.txt'
+CLUB_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+class Club:
+    # 동아리 하나의 설정과 데이터 위치 (기본 동아리는 현재 폴더의 기존 파일을 그대로 쓴다)
+    def __init__(self, club_id, name, departments, directory):
+        self.id = club_id
+        self.name = name
+        self.departments = list(departments)
+        self.directory = directory
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def to_dict(self):
+        return {'id': self.id, 'name': self.name, 'departments': self.departments, 'directory': self.directory}
+
+
+class ClubDirectory:
+    # clubs.json의 동아리 목록을 파일의 mtime/크기가 바뀔 때만 다시 읽는다
+    def __init__(self, path=CLUBS_FILE):
+        self.path = path
+        self.lock = threading.RLock()
+        self.entries = []
+        self.signature = None
+        self.loaded = False
+
+    def file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        with self.lock:
+            signature = self.file_signature()
+            if self.loaded and signature == self.signature:
+                return
+            entries = []
+            if signature is not None:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            self.entries = entries
+            self.signature = signature
+            self.loaded = True
+
+    def base_directory(self):
+        return os.path.dirname(self.path)
+
+    def make_club(self, entry):
+        if entry['id'] == DEFAULT_CLUB:
+            directory = self.base_directory()
+        else:
+            directory = os.path.join(self.base_directory(), CLUBS_DIR, entry['id'])
+        return Club(entry['id'], entry.get('name', entry['id']),
+                    entry.get('departments') or DEFAULT_DEPARTMENTS, directory)
+
+    def clubs(self):
+        self.refresh()
+        entries = list(self.entries)
+        if not any(entry['id'] == DEFAULT_CLUB for entry in entries):
+            entries.insert(0, {'id': DEFAULT_CLUB, 'name': '기본 동아리', 'departments': DEFAULT_DEPARTMENTS})
+        return [self.make_club(entry) for entry in entries]
+
+    def get(self, club_id=DEFAULT_CLUB):
+        for club in self.clubs():
+            if club.id == club_id:
+                return club
+        return None
+
+    def add(self, club_id, name, departments):
+        club_id = club_id.strip()
+        departments = [dept.strip() for dept in departments if dept.strip()]
+        if not CLUB_ID_PATTERN.match(club_id):
+            return False, "동아리 ID는 영문, 숫자, -, _만 사용할 수 있습니다."
+        if not departments:
+            return False, "부서를 하나 이상 입력해주세요."
+        with self.lock:
+            self.refresh()
+            if any(entry['id'] == club_id for entry in self.entries) or club_id == DEFAULT_CLUB:
+                return False, f"{club_id} 동아리가 이미 있습니다."
+            entries = self.entries + [{'id': club_id, 'name': name.strip() or club_id, 'departments': departments}]
+            os.makedirs(self.make_club(entries[-1]).directory, exist_ok=True)
+            atomic_write(self.path, json.dumps(entries, ensure_ascii=False, indent=2))
+            self.entries = entries
+            self.signature = self.file_signature()
+        return True, f"{name.strip() or club_id} 동아리가 추가되었습니다."
+
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+
+def get_club_directory(path=CLUBS_FILE):
+    key = os.path.abspath(path)
+    with _directories_lock:
+        directory = _directories.get(key)
+        if directory is None:
+            directory = ClubDirectory(path)
+            _directories[key] = directory
+        return directory
+
+
+_entries = {}
+_entries_lock = threading.Lock()
+
+
+def club_entry(club):
+    # 동아리마다 프로세스에서 한 번만 초기화한다 (Streamlit 재실행마다 파일 확인을 다시 하지 않음)
+    key = (club.id, os.path.abspath(club.directory), tuple(club.departments))
+    with _entries_lock:
+        entry = _entries.get(key)
+        if entry is None:
+            entry = {'lock': threading.Lock(), 'members': ClubMembers(club), 'system': None, 'warming': False}
+            _entries[key] = entry
+        return entry
+
+
+def get_system(club):
+    entry = club_entry(club)
+    with entry['lock']:
+        if entry['system'] is None:
+            # pandas와 저장소 모듈은 출석 기록이 처음 필요할 때 불러온다 (화면과 HTTP API가 같은 시스템을 쓴다)
+            with STARTUP.measure("출석 모듈 로드"):
+                from attendance import AttendanceSystem
+            with STARTUP.measure(f"시스템 초기화: {club.name}"):
+                entry['system'] = AttendanceSystem(club)
+        elif not entry['system'].storage.exists():
+            # 실행 중에 데이터 파일이 지워졌으면 다시 만든다
+            entry['system'].initialize_data_file()
+        return entry['system']
+
+
+def preload(club):
+    with STARTUP.measure(f"예열: {club.name}"):
+        system = get_system(club)
+        system.records.get_frame()
+        system.member_registry.name_index()
+        # 저장된 보고서 스냅샷을 읽고 바뀐 날짜 이후만 다시 계산해 둔다
+        system.reports.refresh()
+
+
+def warm_up(club):
+    # 백그라운드 스레드에서 시스템을 만들고 출석 데이터와 이름 색인을 미리 읽는다
+    entry = club_entry(club)
+    with _entries_lock:
+        if entry['warming']:
+            return
+        entry['warming'] = True
+    threading.Thread(target=preload, args=(club,), name=f"warm-up-{club.id}", daemon=True).start()
@@ -0,0 +1,104 @@
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from aggregation import STATUSES, AttendanceAggregates
+
+
+def status_snapshot(counter):
+    counts = {status: counter.get(status, 0) for status in STATUSES}
+    counts['합계'] = sum(counter.values())
+    return counts
+
+
+class AttendanceCounters:
+    # 전체/부서/회원/날짜별 출석상태 건수
+    # 기록 추가와 상태 변경 때 O(1)로 갱신된다
+    def __init__(self):
+        self.total = Counter()
+        self.departments = defaultdict(Counter)
+        self.members = defaultdict(lambda: defaultdict(Counter))
+        self.dates = defaultdict(Counter)
+
+    def add(self, department, name, date, status, amount=1):
+        self.total[status] += amount
+        self.departments[department][status] += amount
+        self.members[department][name][status] += amount
+        self.dates[date][status] += amount
+
+    def change(self, department, name, date, old_status, new_status):
+        if old_status == new_status:
+            return
+        self.add(department, name, date, old_status, -1)
+        self.add(department, name, date, new_status, 1)
+
+    def add_records(self, records):
+        for record in records:
+            self.add(record['부서'], record['이름'], record['날짜'], record['출석상태'])
+
+    def department_members(self, department):
+        if department not in self.members:
+            return {}
+        return {
+            name: status_snapshot(counter)
+            for name, counter in self.members[department].items()
+            if sum(counter.values()) > 0
+        }
+
+    def date_table(self):
+        # 기존 groupby/unstack 결과와 같은 모양 (존재하는 상태만 열로, 날짜 오름차순)
+        rows = {date: counter for date, counter in self.dates.items() if sum(counter.values()) > 0}
+        if not rows:
+            return pd.DataFrame(index=pd.Index([], name='날짜'))
+        table = pd.DataFrame.from_dict(rows, orient='index').fillna(0).astype('int64')
+        table = table.loc[:, (table != 0).any()]
+        table = table.sort_index().sort_index(axis=1)
+        table.index.name = '날짜'
+        table.columns.name = '출석상태'
+        return table
+
+    def rows(self):
+        # 저장용 (scope, 부서, 이름, 날짜, 출석상태, 건수) 행 목록
+        for status, count in self.total.items():
+            yield 'total', '', '', '', status, count
+        for department, counter in self.departments.items():
+            for status, count in counter.items():
+                yield 'department', department, '', '', status, count
+        for department, names in self.members.items():
+            for name, counter in names.items():
+                for status, count in counter.items():
+                    yield 'member', department, name, '', status, count
+        for date, counter in self.dates.items():
+            for status, count in counter.items():
+                yield 'date', '', '', date, status, count
+
+    @classmethod
+    def from_rows(cls, rows):
+        counters = cls()
+        for scope, department, name, date, status, count in rows:
+            if scope == 'total':
+                counters.total[status] += count
+            elif scope == 'department':
+                counters.departments[department][status] += count
+            elif scope == 'member':
+                counters.members[department][name][status] += count
+            elif scope == 'date':
+                counters.dates[date][status] += count
+        return counters
+
+    @classmethod
+    def from_frame(cls, df):
+        # 원본 기록에서 다시 만들기
+        counters = cls()
+        if len(df) == 0:
+            return counters
+        counts = AttendanceAggregates(df).counts
+        for status, count in counts.groupby(level='출석상태').sum().items():
+            counters.total[status] = int(count)
+        for (department, status), count in counts.groupby(level=['부서', '출석상태']).sum().items():
+            counters.departments[department][status] = int(count)
+        for (department, name, status), count in counts.groupby(level=['부서', '이름', '출석상태']).sum().items():
+            counters.members[department][name][status] = int(count)
+        for (date, status), count in counts.groupby(level=['날짜', '출석상태']).sum().items():
+            counters.dates[date][status] = int(count)
+        return counters
@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from aggregation import STATUSES
+from clubs import DATA_FILE, MEMBERS_FILE, get_system
+from members import MemberRegistry
+from storage import create_storage
+
+
+def club_signature(club):
+    # 동아리 데이터/회원 파일의 mtime과 크기 (교차 집계 캐시 키)
+    storage = create_storage(club.path(DATA_FILE))
+    signature = [club.id, tuple(club.departments)]
+    for path in storage.watch_paths() + [club.path(MEMBERS_FILE)]:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def club_statistics(club):
+    # 작업 프로세스에서 동아리 하나의 집계 카운터만 읽어 작은 dict로 돌려준다
+    storage = create_storage(os.path.join(club['directory'], DATA_FILE))
+    members = MemberRegistry(os.path.join(club['directory'], MEMBERS_FILE)).get_members()
+    member_counts = {}
+    for dept in members.values():
+        member_counts[dept] = member_counts.get(dept, 0) + 1
+
+    departments = {dept: {status: 0 for status in STATUSES} for dept in club['departments']}
+    counters = storage.load_counters()
+    for dept, counter in counters.departments.items():
+        departments.setdefault(dept, {status: 0 for status in STATUSES})
+        for status in STATUSES:
+            departments[dept][status] = int(counter.get(status, 0))
+    practice_dates = sorted(date for date, counter in counters.dates.items() if sum(counter.values()) > 0)
+
+    return {
+        'id': club['id'],
+        'name': club['name'],
+        'members': len(members),
+        'member_counts': member_counts,
+        'departments': departments,
+        'practices': len(practice_dates),
+        'last_practice': practice_dates[-1] if practice_dates else '',
+    }
+
+
+def merge_statistics(results):
+    club_rows = []
+    department_rows = []
+    for result in results:
+        totals = {status: sum(counts[status] for counts in result['departments'].values()) for status in STATUSES}
+        total = sum(totals.values())
+        club_rows.append({
+            '동아리': result['name'],
+            '회원수': result['members'],
+            '연습횟수': result['practices'],
+            **totals,
+            '출석률': totals['출석'] / total * 100 if total else 0,
+            '평균_출석인원': (totals['출석'] + totals['지각']) / result['practices'] if result['practices'] else 0,
+            '마지막_연습일': result['last_practice'],
+        })
+        for dept, counts in result['departments'].items():
+            dept_total = sum(counts.values())
+            department_rows.append({
+                '동아리': result['name'],
+                '부서': dept,
+                '회원수': result['member_counts'].get(dept, 0),
+                **counts,
+                '출석률': counts['출석'] / dept_total * 100 if dept_total else 0,
+            })
+    return pd.DataFrame(club_rows), pd.DataFrame(department_rows)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_results = {}
+
+
+def get_executor(max_workers=None):
+    # 프로세스 생성 비용이 크므로 풀을 한 번 만들어 재사용한다
+    # 스트림릿/API 서버는 스레드가 여러 개라 fork하면 다른 스레드가 잡고 있던 잠금이 자식에 그대로 남으므로 spawn으로 띄운다
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=max_workers or min(4, os.cpu_count() or 1),
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def cross_club_statistics(clubs, parallel=True):
+    # 동아리별 집계는 프로세스 풀에 나눠 보내고 결과만 합친다
+    # 바뀌지 않은 동아리는 이전 결과를 다시 쓴다
+    for club in clubs:
+        # 데이터 파일이 아직 없는 동아리는 출석 화면과 같이 만들고 엑셀/CSV 기록을 가져온다
+        get_system(club)
+    signatures = {club.id: club_signature(club) for club in clubs}
+    pending = [club for club in clubs if _results.get(club.id, (None,))[0] != signatures[club.id]]
+    if pending:
+        payloads = [club.to_dict() for club in pending]
+        if parallel and len(pending) > 1:
+            results = list(get_executor().map(club_statistics, payloads))
+        else:
+            results = [club_statistics(payload) for payload in payloads]
+        for club, result in zip(pending, results):
+            _results[club.id] = (signatures[club.id], result)
+    return merge_statistics([_results[club.id][1] for club in clubs])
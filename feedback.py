@@ -0,0 +1,290 @@
+import array
+import hashlib
+import importlib.util
+import io
+import itertools
+import math
+import os
+import queue
+import threading
+import time
+import wave
+
+from fileutil import atomic_write
+from profiling import PROFILER
+
+FEEDBACK_DIR = 'feedback_cache'
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+VIDEOS = {
+    '출석': '발광+출결+good.mp4',
+    '지각': '발광+출결+angry.mp4',
+    '결석': '발광+출결+angry.mp4',
+}
+MESSAGES = {
+    '출석': '{name}님, 출석 확인되었습니다.',
+    '지각': '{name}님, 지각으로 기록되었습니다.',
+    '결석': '{name}님, 결석으로 기록되었습니다.',
+}
+# 화면에서 요청한 음성이 미리 만들기 작업보다 먼저 처리된다
+URGENT = 0
+BACKGROUND = 1
+# 합성기가 실패하면 이 시간 동안은 다음 합성기로 바로 넘어간다
+RETRY_SECONDS = 300
+
+
+def feedback_text(name, status):
+    return MESSAGES[status].format(name=name)
+
+
+def video_path(status):
+    path = os.path.join(ASSET_DIR, VIDEOS[status])
+    return path if os.path.exists(path) else None
+
+
+class GTTSSynthesizer:
+    # gtts로 한국어 음성(mp3)을 만든다 (네트워크 필요)
+    extension = 'mp3'
+    mime = 'audio/mpeg'
+
+    def __init__(self, lang='ko'):
+        self.lang = lang
+        self.name = f'gtts-{lang}'
+
+    def synthesize(self, text):
+        from gtts import gTTS
+
+        f = io.BytesIO()
+        gTTS(text=text, lang=self.lang).write_to_fp(f)
+        return f.getvalue()
+
+
+class ToneSynthesizer:
+    # 네트워크 없이 쓰는 대체 합성기: 문구에서 정한 짧은 선율을 WAV로 만든다
+    # 음 높이가 몇 개뿐이라 음마다 파형을 한 번만 계산해 두고 이어 붙인다
+    extension = 'wav'
+    mime = 'audio/wav'
+    SCALE = [392.00, 440.00, 523.25, 587.33, 659.25, 783.99, 880.00, 1046.50]
+
+    def __init__(self, sample_rate=16000, note_seconds=0.12, notes=4):
+        self.sample_rate = sample_rate
+        self.note_seconds = note_seconds
+        self.notes = notes
+        self.name = f'tone-{sample_rate}-{note_seconds}-{notes}'
+        self.waveforms = {}
+
+    def waveform(self, frequency):
+        samples = self.waveforms.get(frequency)
+        if samples is None:
+            count = int(self.sample_rate * self.note_seconds)
+            fade = max(1, count // 8)
+            samples = array.array('h', (
+                int(12000 * math.sin(2 * math.pi * frequency * i / self.sample_rate) * min(1, i / fade, (count - i) / fade))
+                for i in range(count)
+            ))
+            self.waveforms[frequency] = samples
+        return samples
+
+    def synthesize(self, text):
+        digest = hashlib.sha256(text.encode('utf-8')).digest()
+        samples = array.array('h')
+        for byte in digest[:self.notes]:
+            samples.extend(self.waveform(self.SCALE[byte % len(self.SCALE)]))
+        f = io.BytesIO()
+        with wave.open(f, 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.sample_rate)
+            w.writeframes(samples.tobytes())
+        return f.getvalue()
+
+
+def default_synthesizers():
+    # ATTENDANCE_TTS=tone이면 대체 합성기만 쓴다
+    # gtts가 설치되어 있으면 먼저 쓰고, 실패하면(오프라인 등) 대체 합성기로 만든다
+    if os.environ.get('ATTENDANCE_TTS', 'gtts') != 'tone' and importlib.util.find_spec('gtts') is not None:
+        return [GTTSSynthesizer(), ToneSynthesizer()]
+    return [ToneSynthesizer()]
+
+
+class AudioCache:
+    # 합성기와 문구의 해시를 파일 이름으로 쓰는 디스크 캐시
+    # 전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 파일(mtime 기준)부터 지운다
+    def __init__(self, directory=FEEDBACK_DIR, max_bytes=100 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.sizes = None
+
+    def scan(self):
+        if self.sizes is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.sizes = {}
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.startswith('.tmp_'):
+                    self.sizes[entry.name] = entry.stat().st_size
+
+    def file_name(self, key, extension):
+        return f'{key}.{extension}'
+
+    def get(self, key, extension):
+        path = os.path.join(self.directory, self.file_name(key, extension))
+        try:
+            # 읽을 때마다 mtime을 갱신해서 자주 쓰는 파일이 지워지지 않게 한다
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, extension, data):
+        name = self.file_name(key, extension)
+        with self.lock:
+            self.scan()
+            atomic_write(os.path.join(self.directory, name), data)
+            PROFILER.count(bytes_written=len(data))
+            self.sizes[name] = len(data)
+            if sum(self.sizes.values()) > self.max_bytes:
+                self.evict()
+        return os.path.join(self.directory, name)
+
+    def evict(self):
+        # 한 번 지울 때 최대 크기의 90%까지 줄여서 매번 디렉터리를 훑지 않게 한다
+        entries = []
+        for name in self.sizes:
+            try:
+                entries.append((os.stat(os.path.join(self.directory, name)).st_mtime_ns, name))
+            except FileNotFoundError:
+                pass
+        self.sizes = {name: self.sizes[name] for _, name in entries}
+        total = sum(self.sizes.values())
+        for _, name in sorted(entries):
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= self.sizes.pop(name)
+
+    def stats(self):
+        with self.lock:
+            self.scan()
+            return {'files': len(self.sizes), 'bytes': sum(self.sizes.values()), 'max_bytes': self.max_bytes}
+
+
+class FeedbackService:
+    # 동아리원별·상태별 확인 음성을 백그라운드 스레드에서 만들어 디스크에 캐시한다
+    # 출석 체크 화면은 캐시에 있는 음성만 쓰고, 없으면 우선 순위로 합성을 예약한 뒤 영상만 보여 준다
+    def __init__(self, cache, synthesizers, workers=2):
+        self.cache = cache
+        self.synthesizers = synthesizers
+        self.workers = workers
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.threads = []
+        self.pending = {}
+        self.requested = set()
+        self.failed_until = {}
+        self.synthesized = 0
+        self.failures = 0
+
+    def key(self, synthesizer, text):
+        return hashlib.sha256(f'{synthesizer.name}\n{text}'.encode('utf-8')).hexdigest()
+
+    def lookup(self, text):
+        # 앞쪽 합성기의 음성을 우선 쓴다 -> (경로, mime) 또는 None
+        for synthesizer in self.synthesizers:
+            path = self.cache.get(self.key(synthesizer, text), synthesizer.extension)
+            if path is not None:
+                return path, synthesizer.mime
+        return None
+
+    def start(self):
+        # 작업 스레드는 처음 예약할 때 만든다
+        if not self.threads:
+            for index in range(self.workers):
+                thread = threading.Thread(target=self.work, name=f'feedback-{index}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, text, priority=BACKGROUND):
+        with self.lock:
+            # 이미 더 급한 순위로 예약된 문구는 다시 넣지 않는다
+            if self.pending.get(text, priority + 1) <= priority:
+                return
+            self.pending[text] = priority
+            self.start()
+        self.queue.put((priority, next(self.sequence), text))
+
+    def work(self):
+        while True:
+            priority, _, text = self.queue.get()
+            try:
+                with self.lock:
+                    if self.pending.get(text) != priority:
+                        continue
+                if self.lookup(text) is None:
+                    self.synthesize(text)
+            finally:
+                with self.lock:
+                    if self.pending.get(text) == priority:
+                        del self.pending[text]
+                self.queue.task_done()
+
+    def synthesize(self, text):
+        for synthesizer in self.synthesizers:
+            if self.failed_until.get(synthesizer.name, 0) > time.monotonic():
+                continue
+            try:
+                data = synthesizer.synthesize(text)
+            except Exception:
+                self.failed_until[synthesizer.name] = time.monotonic() + RETRY_SECONDS
+                self.failures += 1
+                continue
+            self.cache.put(self.key(synthesizer, text), synthesizer.extension, data)
+            self.synthesized += 1
+            return True
+        return False
+
+    def feedback(self, name, status):
+        # 합성을 기다리지 않는다: 음성이 아직 없으면 None으로 돌려주고 합성을 예약한다
+        text = feedback_text(name, status)
+        audio = self.lookup(text)
+        if audio is None:
+            self.submit(text, URGENT)
+        return {'이름': name, '상태': status, '문구': text, '음성': audio, '영상': video_path(status)}
+
+    def prewarm(self, names):
+        # 동아리원 전체의 상태별 문구를 낮은 순위로 예약한다 (이미 예약한 이름은 건너뜀)
+        with self.lock:
+            names = [name for name in names if name not in self.requested]
+            self.requested.update(names)
+        for name in names:
+            for status in MESSAGES:
+                self.submit(feedback_text(name, status))
+        return len(names)
+
+    def wait(self):
+        self.queue.join()
+
+    def stats(self):
+        with self.lock:
+            pending = len(self.pending)
+        stats = self.cache.stats()
+        stats.update({'pending': pending, 'synthesized': self.synthesized, 'failures': self.failures,
+                      'synthesizers': [synthesizer.name for synthesizer in self.synthesizers]})
+        return stats
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_feedback_service(directory=FEEDBACK_DIR):
+    key = os.path.abspath(directory)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = FeedbackService(AudioCache(directory), default_synthesizers())
+            _services[key] = service
+        return service
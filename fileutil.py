@@ -0,0 +1,34 @@
+import os
+import stat
+import tempfile
+
+# 새로 만드는 파일의 권한
+NEW_FILE_MODE = 0o644
+
+
+def atomic_write(path, data):
+    # 임시 파일에 쓴 뒤 교체해서 쓰는 도중에 파일이 깨지지 않게 한다
+    # data는 문자열/바이트, 또는 임시 파일 경로를 받아 직접 쓰는 함수 (임시 파일은 원래 파일과 같은 확장자)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix=os.path.basename(path))
+    try:
+        if callable(data):
+            os.close(fd)
+            data(temp_path)
+        else:
+            text = isinstance(data, str)
+            with os.fdopen(fd, 'w' if text else 'wb', encoding='utf-8' if text else None) as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        # mkstemp는 0600으로 만들므로 원래 파일의 권한을 그대로 옮기고, 새 파일은 0644로 만든다
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = NEW_FILE_MODE
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,83 @@
+from collections import defaultdict
+
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172
+
+
+def decompose(text):
+    # 한글 음절을 초성/중성/종성 자모로 풀어 한 글자 오타가 자모 하나 차이가 되게 한다
+    jamo = []
+    for char in text:
+        code = ord(char) - HANGUL_BASE
+        if 0 <= code < HANGUL_COUNT:
+            jamo.append(chr(0x1100 + code // 588))
+            jamo.append(chr(0x1161 + (code % 588) // 28))
+            if code % 28:
+                jamo.append(chr(0x11A7 + code % 28))
+        else:
+            jamo.append(char)
+    return ''.join(jamo)
+
+
+def edit_distance(a, b):
+    if a == b:
+        return 0
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def deletions(text, depth):
+    # text에서 자모를 depth개까지 지운 모든 문자열 (자기 자신 포함)
+    variants = {text}
+    frontier = {text}
+    for _ in range(depth):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+        variants |= frontier
+    return variants
+
+
+class NameIndex:
+    # 자모 삭제 이웃 색인: 이름마다 자모를 max_distance개까지 지운 문자열을 미리 색인해 두고
+    # 입력도 같은 방식으로 지워서 만나는 이름만 편집 거리를 계산한다 (후보가 적어 회원 수와 거의 무관)
+    def __init__(self, names, max_distance=2):
+        self.max_distance = max_distance
+        self.names = set(names)
+        self.jamo = {}
+        self.variants = defaultdict(set)
+        for name in self.names:
+            jamo = decompose(name)
+            self.jamo[name] = jamo
+            for variant in deletions(jamo, max_distance):
+                self.variants[variant].add(name)
+
+    def matches(self, token, limit=3):
+        # 편집 거리가 가까운 순으로 [(거리, 이름)]
+        if token in self.names:
+            return [(0, token)]
+        jamo = decompose(token)
+        candidates = set()
+        for variant in deletions(jamo, self.max_distance):
+            candidates |= self.variants.get(variant, set())
+        scored = []
+        for name in candidates:
+            distance = edit_distance(jamo, self.jamo[name])
+            if distance <= self.max_distance:
+                scored.append((distance, name))
+        scored.sort()
+        return scored[:limit]
+
+    def resolve(self, token, limit=3):
+        # 정확히 일치하거나 거리 1인 이름이 하나뿐이면 그 이름으로 본다
+        matches = self.matches(token, limit)
+        if matches and matches[0][0] == 0:
+            return token, [], '일치'
+        closest = [name for distance, name in matches if distance == 1]
+        if len(closest) == 1:
+            return closest[0], [], '자동 보정'
+        suggestions = [name for _, name in matches]
+        return None, suggestions, '후보' if suggestions else '없음'
@@ -0,0 +1,115 @@
+import re
+
+import pandas as pd
+
+from aggregation import STATUSES
+
+DATE_PATTERN = re.compile(r'^\d{4}[-./]\d{1,2}[-./]\d{1,2}$')
+INPUT_COLUMNS = ['날짜', '이름', '출석상태', '비고']
+RECORD_COLUMNS = ['날짜', '이름', '부서', '출석상태', '비고']
+# 엑셀 날짜 칸을 문자열로 읽으면 붙는 자정 시각 ('2025-03-26 00:00:00')
+MIDNIGHT_PATTERN = r'[ T]00:00:00(\.0+)?$'
+
+
+def parse_roster(text, default_date, default_status='출석', members=None):
+    # 한 줄에 한 명: "날짜, 이름, 상태" / "이름, 상태" / "이름" (빠진 값은 기본값 사용)
+    # members를 주면 "원유진 조퇴함"처럼 이름 뒤에 붙은 모르는 단어를 이름에 합치지 않고 출석상태로 본다 (잘못된 출석상태로 걸러짐)
+    rows = []
+    for line in text.splitlines():
+        tokens = [token.strip() for token in re.split(r'[,\t]', line) if token.strip()]
+        if not tokens:
+            continue
+        row = {'날짜': default_date, '이름': None, '출석상태': default_status, '비고': ''}
+        names = []
+        for token in tokens:
+            if DATE_PATTERN.match(token):
+                row['날짜'] = token
+            elif token in STATUSES:
+                row['출석상태'] = token
+            else:
+                names.append(token)
+        name = ' '.join(names)
+        words = name.split()
+        if members is not None and name not in members and len(words) > 1 and ' '.join(words[:-1]) in members:
+            name = ' '.join(words[:-1])
+            row['출석상태'] = words[-1]
+        row['이름'] = name
+        rows.append(row)
+    return pd.DataFrame(rows, columns=INPUT_COLUMNS)
+
+
+def read_roster_file(file, default_date, default_status='출석'):
+    if file.name.endswith('.csv'):
+        df = pd.read_csv(file, dtype=str, encoding='utf-8-sig')
+    else:
+        df = pd.read_excel(file, dtype=str)
+    df.columns = [str(column).strip() for column in df.columns]
+    df = df.reindex(columns=INPUT_COLUMNS)
+    df['날짜'] = df['날짜'].fillna(default_date)
+    df['출석상태'] = df['출석상태'].fillna(default_status)
+    df['비고'] = df['비고'].fillna('')
+    return df
+
+
+def normalize_dates(dates):
+    text = dates.astype(str).str.strip().str.replace(MIDNIGHT_PATTERN, '', regex=True)
+    parsed = pd.to_datetime(text.str.replace(r'[./]', '-', regex=True), format='%Y-%m-%d', errors='coerce')
+    return parsed.dt.strftime('%Y-%m-%d')
+
+
+def check_rows(report, members, departments=None):
+    # 행별 검증 결과 ('기록됨'이 아니면 기록하지 않는 이유)
+    result = pd.Series('기록됨', index=report.index)
+    result[~report['출석상태'].isin(STATUSES)] = '잘못된 출석상태'
+    if departments is not None:
+        result[~report['부서'].isin(departments)] = '없는 부서'
+    result[~report['이름'].isin(members)] = '동아리원 목록에 없음'
+    result[report['날짜'].isna()] = '잘못된 날짜'
+    result[report['이름'] == ''] = '이름 없음'
+    return result
+
+
+def plan_migration(chunk):
+    # 처음 만들 때 엑셀/CSV 기록을 옮기는 경우: 과거 기록이므로 동아리원·부서 확인 없이 날짜 형식만 맞춘다
+    # (읽을 수 없는 날짜는 그대로 두고, (날짜, 이름) 중복은 저장소의 insert가 거른다)
+    rows = chunk.reindex(columns=RECORD_COLUMNS).reset_index(drop=True)
+    rows['날짜'] = normalize_dates(rows['날짜']).fillna(rows['날짜'])
+    rows = rows.fillna('')
+    return rows.to_dict('records'), {}
+
+
+def plan_import(chunk, members, departments):
+    # 가져올 파일의 한 청크를 일괄 입력과 같은 기준으로 검증한다 -> (기록할 행, {사유: 건수})
+    # 부서가 비어 있으면 동아리원 목록의 부서를 쓰고, 적혀 있으면 그 부서가 있는지만 확인한다 (과거 부서 기록 유지)
+    rows = chunk.reindex(columns=RECORD_COLUMNS).reset_index(drop=True)
+    rows['이름'] = rows['이름'].fillna('').astype(str).str.strip()
+    rows['출석상태'] = rows['출석상태'].fillna('').astype(str).str.strip()
+    rows['비고'] = rows['비고'].fillna('')
+    rows['날짜'] = normalize_dates(rows['날짜'])
+    departments_in_file = rows['부서'].fillna('').astype(str).str.strip()
+    rows['부서'] = departments_in_file.where(departments_in_file != '', rows['이름'].map(members))
+    result = check_rows(rows, members, departments)
+    valid = result == '기록됨'
+    return rows.loc[valid, RECORD_COLUMNS].to_dict('records'), result[~valid].value_counts().to_dict()
+
+
+def plan_bulk_insert(rows, members, records):
+    # 여러 행을 한 번에 검증한다: 회원 확인은 이름→부서 매핑, 중복 확인은 (날짜, 이름) 키 집합으로
+    report = rows.reindex(columns=INPUT_COLUMNS).reset_index(drop=True)
+    report['이름'] = report['이름'].fillna('').astype(str).str.strip()
+    report['출석상태'] = report['출석상태'].fillna('').astype(str).str.strip()
+    report['비고'] = report['비고'].fillna('')
+    report['날짜'] = normalize_dates(report['날짜'])
+    report['부서'] = report['이름'].map(members)
+
+    result = check_rows(report, members)
+
+    keys = pd.Series(list(zip(report['날짜'], report['이름'])), index=report.index)
+    existing = records.existing_keys(keys[result == '기록됨'])
+    result[(result == '기록됨') & keys.isin(existing)] = '이미 출석 기록이 있음'
+    valid = result == '기록됨'
+    result[valid & keys[valid].duplicated().reindex(report.index, fill_value=False)] = '중복 입력'
+    report['결과'] = result
+
+    new_records = report.loc[result == '기록됨', ['날짜', '이름', '부서', '출석상태', '비고']]
+    return report[['날짜', '이름', '부서', '출석상태', '결과']], new_records.to_dict('records')
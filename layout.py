@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+from aggregation import STATUSES
+from storage import COLUMNS
+
+CATEGORY_COLUMNS = ['이름', '부서', '출석상태', '비고']
+
+
+def to_typed(df):
+    # 날짜는 datetime64, 나머지는 범주형으로 바꾸고 날짜 순으로 (같은 날짜는 입력 순서 유지) 정렬한다
+    typed = pd.DataFrame({
+        '날짜': parse_dates(df['날짜']),
+        '이름': pd.Categorical(df['이름']),
+        '부서': pd.Categorical(df['부서']),
+        '출석상태': pd.Categorical(df['출석상태'], categories=status_categories(df['출석상태'])),
+        '비고': pd.Categorical(pd.Series(df['비고'], dtype=object).fillna('')),
+    })
+    if not typed['날짜'].is_monotonic_increasing:
+        typed = typed.sort_values('날짜', kind='stable')
+    return typed.reset_index(drop=True)
+
+
+def parse_dates(dates):
+    dates = pd.Series(dates, dtype=object)
+    try:
+        return pd.to_datetime(dates, format='%Y-%m-%d')
+    except ValueError:
+        # 엑셀에서 가져온 '2025-03-26 00:00:00' 같은 값
+        return pd.to_datetime(dates, format='ISO8601')
+
+
+def status_categories(statuses):
+    extra = sorted(set(statuses) - set(STATUSES))
+    return STATUSES + extra
+
+
+def to_public(typed):
+    # 기존과 같은 문자열 컬럼으로 돌려준다
+    return pd.DataFrame({
+        '날짜': typed['날짜'].dt.strftime('%Y-%m-%d').astype(str),
+        '이름': typed['이름'].astype(str),
+        '부서': typed['부서'].astype(str),
+        '출석상태': typed['출석상태'].astype(str),
+        '비고': typed['비고'].astype(str),
+    }, columns=COLUMNS).reset_index(drop=True)
+
+
+def public_columns(df):
+    # 집계 결과에 남은 datetime/범주형 컬럼을 문자열로 바꾼다
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].dt.strftime('%Y-%m-%d').astype(str)
+        elif isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(str)
+    return df
+
+
+def append_rows(typed, records):
+    new_rows = pd.DataFrame(records, columns=COLUMNS)
+    if len(typed) == 0:
+        return to_typed(new_rows)
+    new_rows['비고'] = new_rows['비고'].fillna('')
+    # 범주 코드 배열을 직접 이어 붙인다 (기존 행은 범주 추가만 하므로 코드가 바뀌지 않는다)
+    columns = {'날짜': np.concatenate([typed['날짜'].to_numpy(), parse_dates(new_rows['날짜']).to_numpy()])}
+    for column in CATEGORY_COLUMNS:
+        categories = typed[column].cat.categories
+        values = new_rows[column].to_numpy(dtype=object)
+        codes = categories.get_indexer(values)
+        if (codes < 0).any():
+            categories = categories.append(pd.Index(pd.unique(values[codes < 0])))
+            codes = categories.get_indexer(values)
+        columns[column] = pd.Categorical.from_codes(
+            np.concatenate([typed[column].cat.codes.to_numpy(), codes]), categories=categories
+        )
+    combined = pd.DataFrame(columns, columns=COLUMNS)
+    new_dates = columns['날짜'][len(typed):]
+    if new_dates[0] < typed['날짜'].iloc[-1] or not (np.diff(new_dates) >= np.timedelta64(0)).all():
+        # 과거 날짜를 뒤늦게 입력한 경우에만 다시 정렬한다
+        combined = combined.sort_values('날짜', kind='stable').reset_index(drop=True)
+    return combined
+
+
+def as_datetime(value, dates):
+    return np.datetime64(pd.Timestamp(value)).astype(dates.dtype)
+
+
+def date_bounds(typed, date=None, start_date=None, end_date=None):
+    # 정렬된 날짜 열에서 이진 탐색으로 [lo, hi) 범위를 구한다
+    dates = typed['날짜'].to_numpy()
+    if date is not None:
+        start_date = end_date = date
+    lo = 0 if start_date is None else int(np.searchsorted(dates, as_datetime(start_date, dates), 'left'))
+    hi = len(dates) if end_date is None else int(np.searchsorted(dates, as_datetime(end_date, dates), 'right'))
+    return lo, max(lo, hi)
+
+
+def category_mask(column, value):
+    categories = column.cat.categories
+    if value not in categories:
+        return np.zeros(len(column), dtype=bool)
+    return column.cat.codes.to_numpy() == categories.get_loc(value)
+
+
+def select(typed, date=None, name=None, department=None, start_date=None, end_date=None):
+    lo, hi = date_bounds(typed, date, start_date, end_date)
+    part = typed.iloc[lo:hi]
+    if name is not None:
+        part = part[category_mask(part['이름'], name)]
+    if department is not None:
+        part = part[category_mask(part['부서'], department)]
+    return part
+
+
+def find_row(typed, date, name):
+    # (날짜, 이름) 행 위치, 없으면 None
+    lo, hi = date_bounds(typed, date=date)
+    if lo == hi:
+        return None
+    matches = np.flatnonzero(category_mask(typed['이름'].iloc[lo:hi], name))
+    return lo + int(matches[0]) if len(matches) else None
+
+
+def existing_keys(typed, keys):
+    # 날짜별로 묶어 해당 날짜 구간 안에서만 이름을 찾는다
+    found = set()
+    by_date = {}
+    for date, name in keys:
+        by_date.setdefault(date, set()).add(name)
+    names = typed['이름']
+    for date, candidates in by_date.items():
+        try:
+            lo, hi = date_bounds(typed, date=date)
+        except (ValueError, TypeError):
+            continue
+        if lo == hi:
+            continue
+        recorded = set(names.iloc[lo:hi].astype(str))
+        found.update((date, name) for name in candidates & recorded)
+    return found
@@ -0,0 +1,181 @@
+import bisect
+
+import numpy as np
+import pandas as pd
+
+# 0은 기록 없음
+STATUS_CODES = {'출석': 1, '지각': 2, '결석': 3}
+
+
+class AttendanceMatrix:
+    # 회원 × 연습일 출석상태 코드 행렬 (연습일은 날짜 오름차순)
+    # 출석 체크와 상태 수정 때 해당 칸만 갱신한다
+    def __init__(self):
+        self.names = []
+        self.name_index = {}
+        self.departments = []
+        self.dates = []
+        self.date_index = {}
+        self.buffer = np.zeros((16, 16), dtype=np.int8)
+
+    @property
+    def codes(self):
+        return self.buffer[:len(self.names), :len(self.dates)]
+
+    def reserve(self, rows, cols):
+        # 용량을 두 배씩 늘려 행/열 추가를 분할 상환 O(1)로 만든다
+        height, width = self.buffer.shape
+        if rows <= height and cols <= width:
+            return
+        while height < rows:
+            height *= 2
+        while width < cols:
+            width *= 2
+        buffer = np.zeros((height, width), dtype=np.int8)
+        buffer[:self.buffer.shape[0], :self.buffer.shape[1]] = self.buffer
+        self.buffer = buffer
+
+    def ensure_name(self, name, department):
+        row = self.name_index.get(name)
+        if row is None:
+            row = len(self.names)
+            self.reserve(row + 1, len(self.dates))
+            self.names.append(name)
+            self.departments.append(department)
+            self.name_index[name] = row
+        else:
+            self.departments[row] = department
+        return row
+
+    def ensure_date(self, date):
+        col = self.date_index.get(date)
+        if col is not None:
+            return col
+        count = len(self.dates)
+        self.reserve(len(self.names), count + 1)
+        if not self.dates or date > self.dates[-1]:
+            col = count
+            self.dates.append(date)
+        else:
+            # 과거 날짜를 뒤늦게 입력한 경우에만 열을 밀어 넣는다
+            col = bisect.bisect_left(self.dates, date)
+            self.buffer[:, col + 1:count + 1] = self.buffer[:, col:count].copy()
+            self.buffer[:, col] = 0
+            self.dates.insert(col, date)
+            for shifted, moved in enumerate(self.dates[col + 1:], start=col + 1):
+                self.date_index[moved] = shifted
+        self.date_index[date] = col
+        return col
+
+    def set(self, date, name, department, status):
+        row = self.ensure_name(name, department)
+        col = self.ensure_date(date)
+        self.buffer[row, col] = STATUS_CODES.get(status, 0)
+
+    def add_records(self, records):
+        for record in records:
+            self.set(record['날짜'], record['이름'], record['부서'], record['출석상태'])
+
+    def change(self, department, name, date, old_status, new_status):
+        self.set(date, name, department, new_status)
+
+    @classmethod
+    def from_frame(cls, df):
+        matrix = cls()
+        if len(df) == 0:
+            return matrix
+        name_codes, names = pd.factorize(df['이름'])
+        date_codes, dates = pd.factorize(df['날짜'], sort=True)
+        matrix.reserve(len(names), len(dates))
+        matrix.names = [str(name) for name in names]
+        matrix.name_index = {name: row for row, name in enumerate(matrix.names)}
+        # 회원별 가장 최근 기록의 부서
+        latest = df.assign(_row=name_codes).sort_values('날짜', kind='stable').drop_duplicates('_row', keep='last')
+        departments = dict(zip(latest['_row'], latest['부서']))
+        matrix.departments = [str(departments[row]) for row in range(len(names))]
+        if isinstance(dates, pd.DatetimeIndex):
+            dates = dates.strftime('%Y-%m-%d')
+        matrix.dates = list(dates)
+        matrix.date_index = {date: col for col, date in enumerate(matrix.dates)}
+        status = df['출석상태'].astype(object).map(STATUS_CODES).fillna(0).to_numpy(dtype=np.int8)
+        matrix.buffer[name_codes, date_codes] = status
+        return matrix
+
+
+def member_activity(codes):
+    # 출석/지각은 참석, 첫 기록 이후의 연습일만 활동 기간으로 본다
+    n, d = codes.shape
+    present = (codes == 1) | (codes == 2)
+    if n == 0 or d == 0:
+        # 기록이 아직 없는 동아리 (argmax는 빈 행에서 실패한다)
+        return present, np.zeros((n, d), dtype=bool)
+    recorded = codes > 0
+    first = np.where(recorded.any(axis=1), recorded.argmax(axis=1), d)
+    active = np.arange(d)[None, :] >= first[:, None]
+    return present & active, active
+
+
+def window_sums(values, window):
+    # t번째 열은 t번째 연습일까지 최근 window회의 합
+    cumulative = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=cumulative[:, 1:])
+    end = np.arange(1, values.shape[1] + 1)
+    return cumulative[:, end] - cumulative[:, np.maximum(end - window, 0)]
+
+
+def rolling_rates(present, active, window):
+    # 회원 × 연습일별 최근 window회 출석률 (활동 기간이 없으면 0)
+    attended = window_sums(present, window)
+    possible = window_sums(active, window)
+    return np.divide(attended, possible, out=np.zeros(attended.shape), where=possible > 0)
+
+
+def absence_runs(missed):
+    # 연속 결석 구간을 런 길이 인코딩으로 찾아 회원별 최장/현재(마지막 연습일까지) 길이를 구한다
+    n, d = missed.shape
+    padded = np.zeros((n, d + 2), dtype=np.int8)
+    padded[:, 1:-1] = missed
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    lengths = ends - starts
+    longest = np.zeros(n, dtype=int)
+    np.maximum.at(longest, rows, lengths)
+    current = np.zeros(n, dtype=int)
+    ongoing = ends == d
+    current[rows[ongoing]] = lengths[ongoing]
+    return longest, current
+
+
+RISK_COLUMNS = ['이름', '부서', '최근_결석', '최근_출석률', '현재_연속결석', '최장_연속결석', '마지막_출석일']
+
+
+def at_risk_members(matrix, members, window=5, min_missed=3, department=None, top=None):
+    # 최근 window회 연습 중 min_missed회 이상 빠진 현재 동아리원을 결석이 많은 순으로
+    codes = matrix.codes
+    if codes.size == 0:
+        return pd.DataFrame(columns=RISK_COLUMNS)
+    present, active = member_activity(codes)
+    missed = active & ~present
+    recent_missed = missed[:, -window:].sum(axis=1)
+    recent_rate = rolling_rates(present, active, window)[:, -1] * 100
+    longest, current = absence_runs(missed)
+    d = codes.shape[1]
+    last_seen = np.where(present.any(axis=1), d - 1 - present[:, ::-1].argmax(axis=1), -1)
+
+    rows = np.array([name in members and (department is None or members[name] == department)
+                     for name in matrix.names], dtype=bool)
+    rows &= recent_missed >= min_missed
+    selected = np.flatnonzero(rows)
+    result = pd.DataFrame({
+        '이름': [matrix.names[row] for row in selected],
+        '부서': [members[matrix.names[row]] for row in selected],
+        '최근_결석': recent_missed[selected],
+        '최근_출석률': recent_rate[selected],
+        '현재_연속결석': current[selected],
+        '최장_연속결석': longest[selected],
+        '마지막_출석일': [matrix.dates[col] if col >= 0 else '' for col in last_seen[selected]],
+    }, columns=RISK_COLUMNS)
+    result = result.sort_values(['최근_결석', '현재_연속결석', '최근_출석률', '이름'],
+                                ascending=[False, False, True, True]).reset_index(drop=True)
+    return result.head(top) if top else result
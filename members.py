@@ -0,0 +1,168 @@
+import os
+import threading
+from types import MappingProxyType
+
+from fileutil import atomic_write
+from hangul import NameIndex
+from profiling import PROFILER, profile_methods
+
+
+def split_names(names):
+    # 출석 체크 입력: 쉼표나 공백으로 구분한 이름들
+    return [name.strip() for name in names.replace(',', ' ').split() if name.strip()]
+
+
+class MemberRegistry:
+    # 동아리원 목록을 한 번만 읽고 파일의 mtime/크기가 바뀔 때만 다시 읽는다
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.members = {}
+        self.by_department = {}
+        self.signature = None
+        # 목록이 바뀔 때마다 증가하는 버전
+        self.version = 0
+        # 이름 오타 보정용 색인: [색인, 버전]
+        self.index = None
+
+    def file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self):
+        members = {}
+        signature = self.file_signature()
+        if signature is not None:
+            PROFILER.count(bytes_read=signature[1])
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        name, dept = line.strip().split(',')
+                        members[name.strip()] = dept.strip()
+        self.set_members(members)
+        self.signature = signature
+
+    def set_members(self, members):
+        by_department = {}
+        for name, dept in members.items():
+            by_department.setdefault(dept, []).append(name)
+        self.members = members
+        self.by_department = by_department
+        self.version += 1
+
+    def refresh(self):
+        with self.lock:
+            if self.signature is None or self.file_signature() != self.signature:
+                PROFILER.count(cache_misses=1)
+                self.reload()
+            else:
+                PROFILER.count(cache_hits=1)
+
+    def current_version(self):
+        self.refresh()
+        return self.version
+
+    def get_members(self):
+        self.refresh()
+        return MappingProxyType(self.members)
+
+    def name_index(self):
+        with self.lock:
+            self.refresh()
+            if self.index is None or self.index[1] != self.version:
+                PROFILER.count(cache_misses=1)
+                self.index = [NameIndex(self.members), self.version]
+            else:
+                PROFILER.count(cache_hits=1)
+            return self.index[0]
+
+    def department_members(self, department):
+        self.refresh()
+        return list(self.by_department.get(department, []))
+
+    def save(self, members):
+        text = ''.join(f"{name},{dept}\n" for name, dept in members.items())
+        atomic_write(self.path, text)
+        PROFILER.count(bytes_written=len(text.encode('utf-8')))
+        self.set_members(members)
+        self.signature = self.file_signature()
+
+    def add(self, name, department):
+        with self.lock:
+            self.refresh()
+            if name in self.members:
+                return False
+            members = dict(self.members)
+            members[name] = department
+            self.save(members)
+            return True
+
+    def remove(self, name):
+        with self.lock:
+            self.refresh()
+            if name not in self.members:
+                return False
+            members = dict(self.members)
+            del members[name]
+            self.save(members)
+            return True
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_member_registry(path):
+    key = os.path.abspath(path)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = MemberRegistry(path)
+            _registries[key] = registry
+        return registry
+
+
+@profile_methods
+class ClubMembers:
+    # 동아리 하나의 동아리원 목록과 부서 (pandas 없이 동작해서 동아리원 관리 화면은 가볍게 뜬다)
+    # AttendanceSystem이 이 클래스를 상속해 출석 기록 기능을 더한다
+    def __init__(self, club):
+        self.club = club
+        self.members_file = club.path('members_list.txt')
+        self.member_registry = get_member_registry(self.members_file)
+        self.departments = club.departments
+        self.initialize_members_file()
+
+    def initialize_members_file(self):
+        if not os.path.exists(self.members_file):
+            with open(self.members_file, 'w', encoding='utf-8') as f:
+                f.write("")
+
+    def get_members_list(self):
+        return self.member_registry.get_members()
+
+    def get_department_members(self, department):
+        return self.member_registry.department_members(department)
+
+    def add_member(self, name, department):
+        if department not in self.departments:
+            return False, "존재하지 않는 부서입니다."
+            
+        if self.member_registry.add(name, department):
+            return True, f"{name}님이 {department} 부서에 추가되었습니다."
+        return False, f"{name}님은 이미 동아리원 목록에 있습니다."
+
+    def remove_member(self, name):
+        return self.member_registry.remove(name)
+
+    def resolve_names(self, name_list):
+        # 입력한 이름마다 (입력, 이름, 후보, 방식)
+        index = self.member_registry.name_index()
+        resolved = []
+        for token in name_list:
+            name, suggestions, method = index.resolve(token)
+            resolved.append({'입력': token, '이름': name, '후보': suggestions, '방식': method})
+        return resolved
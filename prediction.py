@@ -0,0 +1,242 @@
+import bisect
+import threading
+
+import numpy as np
+import pandas as pd
+
+from matrix import member_activity
+
+FEATURES = ['최근4회_출석률', '최근8회_출석률', '누적_출석률', '연속_출석', '연속_결석', '요일_출석률', '부서_최근_출석률']
+
+
+def exclusive_cumsum(values):
+    # t번째 열에는 t 이전 연습일까지의 합이 들어간다
+    result = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=result[:, 1:])
+    return result
+
+
+def safe_ratio(numerator, denominator):
+    return np.divide(numerator, denominator,
+                     out=np.zeros(np.shape(numerator), dtype=float), where=denominator > 0)
+
+
+def build_features(codes, dates, departments, target_weekday, features=None, start=0):
+    # 회원 × (연습일 + 1) × 특성 배열
+    # t번째 칸은 t번째 연습일 이전 기록만으로 만든 특성이고, 마지막 칸은 다음 연습 예측용이다
+    # features를 주면 start번째 칸부터만 그 자리에 다시 계산한다 (앞 칸은 이전 결과를 그대로 둔다)
+    n, d = codes.shape
+    if features is None:
+        features = np.zeros((n, d + 1, len(FEATURES)))
+        start = 0
+    present, active = member_activity(codes)
+    present = present.astype(float)
+    active = active.astype(float)
+
+    cum_present = exclusive_cumsum(present)
+    cum_active = exclusive_cumsum(active)
+    t = np.arange(start, d + 1)
+
+    def window(k):
+        begin = np.maximum(t - k, 0)
+        return cum_present[:, t] - cum_present[:, begin], cum_active[:, t] - cum_active[:, begin]
+
+    recent4 = safe_ratio(*window(4))
+    recent8 = safe_ratio(*window(8))
+    overall = safe_ratio(cum_present[:, t], cum_active[:, t])
+
+    # 연속 출석/결석은 start 앞 칸의 값에서 이어서 센다
+    streak_present = np.zeros((n, len(t)))
+    streak_absent = np.zeros((n, len(t)))
+    current_present = features[:, start - 1, FEATURES.index('연속_출석')] if start > 0 else np.zeros(n)
+    current_absent = features[:, start - 1, FEATURES.index('연속_결석')] if start > 0 else np.zeros(n)
+    for i, col in enumerate(t):
+        if col > 0:
+            current_present = np.where(present[:, col - 1] > 0, current_present + 1, 0)
+            current_absent = np.where((active[:, col - 1] > 0) & (present[:, col - 1] == 0), current_absent + 1, 0)
+        streak_present[:, i] = current_present
+        streak_absent[:, i] = current_absent
+
+    weekdays = pd.to_datetime(pd.Series(dates, dtype=object)).dt.dayofweek.to_numpy()
+    all_weekdays = np.append(weekdays, target_weekday)[start:]
+    weekday_rate = np.zeros((n, len(t)))
+    for weekday in np.unique(all_weekdays):
+        mask = (weekdays == weekday).astype(float)
+        columns = all_weekdays == weekday
+        # start 이전 같은 요일 합에 start 이후 누적을 더한다
+        cols = t[columns] - start
+        weekday_present = (present[:, :start] @ mask[:start])[:, None] + exclusive_cumsum(present[:, start:] * mask[start:])[:, cols]
+        weekday_active = (active[:, :start] @ mask[:start])[:, None] + exclusive_cumsum(active[:, start:] * mask[start:])[:, cols]
+        weekday_rate[:, columns] = safe_ratio(weekday_present, weekday_active)
+
+    department_codes, department_names = pd.factorize(pd.Series(departments, dtype=object))
+    onehot = np.zeros((n, len(department_names)))
+    onehot[np.arange(n), department_codes] = 1
+    present4, active4 = window(4)
+    department_rate = onehot @ safe_ratio(onehot.T @ present4, onehot.T @ active4)
+
+    features[:, start:] = np.stack([recent4, recent8, overall, streak_present, streak_absent,
+                                    weekday_rate, department_rate], axis=2)
+    return features, cum_active, present
+
+
+class LogisticModel:
+    # numpy만 쓰는 L2 정규화 로지스틱 회귀 (뉴턴법)
+    def __init__(self, l2=1.0, iterations=25):
+        self.l2 = l2
+        self.iterations = iterations
+        self.weights = None
+
+    def design(self, X):
+        Z = (X - self.mean) / self.scale
+        return np.hstack([np.ones((len(Z), 1)), Z])
+
+    def fit(self, X, y):
+        if len(y) == 0:
+            self.weights = None
+            return self
+        self.mean = X.mean(axis=0)
+        self.scale = X.std(axis=0)
+        self.scale[self.scale == 0] = 1
+        Z = self.design(X)
+        penalty = np.full(Z.shape[1], self.l2)
+        penalty[0] = 0
+        weights = np.zeros(Z.shape[1])
+        for _ in range(self.iterations):
+            p = 1 / (1 + np.exp(-(Z @ weights)))
+            gradient = Z.T @ (p - y) + penalty * weights
+            hessian = (Z * (p * (1 - p))[:, None]).T @ Z + np.diag(penalty + 1e-9)
+            step = np.linalg.solve(hessian, gradient)
+            weights -= step
+            if np.abs(step).max() < 1e-6:
+                break
+        self.weights = weights
+        return self
+
+    def predict(self, X):
+        if self.weights is None:
+            # 학습할 기록이 없으면 누적 출석률을 그대로 쓴다
+            return X[:, FEATURES.index('누적_출석률')]
+        return 1 / (1 + np.exp(-(self.design(X) @ self.weights)))
+
+
+class AttendancePredictor:
+    # 저장소 버전별로 특성과 모델을 캐시한다
+    # 특성은 repository의 파생 데이터로 등록해 쓰기 알림을 받고, 바뀐 연습일 이후 칸만 다시 계산한다
+    # (새 회원이 생기거나 부서가 바뀌면 처음부터 다시 만든다)
+    def __init__(self, repository, train_window=60):
+        self.repository = repository
+        self.train_window = train_window
+        self.lock = threading.Lock()
+        self.features_key = None
+        self.cached_features = None
+        # 특성 배열 버퍼 (연습일 축은 두 배씩 늘린다)
+        self.buffer = None
+        self.departments = None
+        self.computed_dates = 0
+        # 이 날짜 이후 칸은 다시 계산해야 한다 (None이면 최신, ''이면 전부)
+        self.dirty_from = ''
+        self.model_version = None
+        self.model = None
+
+    def mark_dirty(self, date):
+        if self.dirty_from is None or date < self.dirty_from:
+            self.dirty_from = date
+
+    def add_records(self, records):
+        if records:
+            self.mark_dirty(min(record['날짜'] for record in records))
+
+    def change(self, department, name, date, old_status, new_status):
+        self.mark_dirty(date)
+
+    def sync(self, frame):
+        # 출석 기록을 다시 읽었으면 처음부터 다시 만든다
+        self.dirty_from = ''
+        return self
+
+    def features(self, target_weekday):
+        # self.lock 안에서만 부른다 (버퍼를 그 자리에서 고치므로 읽는 쪽도 같은 잠금을 쓴다)
+        with self.repository.lock:
+            matrix = self.repository.matrix()
+            self.repository.view('prediction_features', self.sync)
+            key = (self.repository.version, target_weekday)
+            if self.features_key == key:
+                return self.cached_features
+            n, d = len(matrix.names), len(matrix.dates)
+            # 행렬을 새로 만들었거나 회원·부서가 바뀌면 처음부터 다시 만든다
+            if (self.dirty_from == '' or self.cached_features is None or self.cached_features[0] is not matrix
+                    or self.buffer.shape[0] != n or self.departments != matrix.departments):
+                start = 0
+                self.buffer = np.zeros((n, max(2 * (d + 1), 16), len(FEATURES)))
+            else:
+                # 바뀐 연습일 칸부터 다시 계산한다 (새로 끼워 넣은 날짜는 그 칸의 요일 특성도 바뀐다)
+                # 요일만 달라졌으면 이전 예측용 칸부터 다시 계산한다
+                start = self.computed_dates
+                if self.dirty_from is not None:
+                    start = min(start, bisect.bisect_left(matrix.dates, self.dirty_from))
+                if self.buffer.shape[1] < d + 1:
+                    buffer = np.zeros((n, 2 * (d + 1), len(FEATURES)))
+                    buffer[:, :start] = self.buffer[:, :start]
+                    self.buffer = buffer
+            features, cum_active, present = build_features(
+                matrix.codes, matrix.dates, matrix.departments, target_weekday,
+                features=self.buffer[:, :d + 1], start=start
+            )
+            self.cached_features = (matrix, features, cum_active, present)
+            self.departments = list(matrix.departments)
+            self.computed_dates = d
+            self.dirty_from = None
+            self.features_key = key
+            return self.cached_features
+
+    def fit(self, target_weekday):
+        with self.lock:
+            matrix, features, cum_active, present = self.features(target_weekday)
+            if self.model_version == self.features_key[0]:
+                return self.model
+            d = len(matrix.dates)
+            start = max(d - self.train_window, 0)
+            # 이전 기록이 있는 회원의 각 연습일을 학습 샘플로 쓴다
+            rows, cols = np.nonzero(cum_active[:, start:d] > 0)
+            cols = cols + start
+            self.model = LogisticModel().fit(features[rows, cols], present[rows, cols])
+            self.model_version = self.features_key[0]
+            return self.model
+
+    def forecast(self, target_date, members):
+        target_weekday = pd.Timestamp(target_date).dayofweek
+        model = self.fit(target_weekday)
+        names = list(members.keys())
+        current = np.zeros((len(names), len(FEATURES)))
+        with self.lock:
+            matrix, features, _, _ = self.features(target_weekday)
+            for i, name in enumerate(names):
+                row = matrix.name_index.get(name)
+                if row is not None:
+                    current[i] = features[row, -1]
+        probability = model.predict(current) if len(names) else np.zeros(0)
+
+        forecast = pd.DataFrame(current, columns=FEATURES)
+        forecast.insert(0, '이름', names)
+        forecast.insert(1, '부서', [members[name] for name in names])
+        forecast.insert(2, '출석확률', probability)
+        return forecast.sort_values('출석확률', ascending=False).reset_index(drop=True)
+
+
+def expected_headcount(forecast, departments):
+    headcount = forecast.groupby('부서')['출석확률'].sum().reindex(departments, fill_value=0)
+    return headcount.rename('예상인원').rename_axis('부서').reset_index()
+
+
+_predictors = {}
+_predictors_lock = threading.Lock()
+
+
+def get_predictor(repository):
+    with _predictors_lock:
+        predictor = _predictors.get(id(repository))
+        if predictor is None:
+            predictor = AttendancePredictor(repository)
+            _predictors[id(repository)] = predictor
+        return predictor
@@ -0,0 +1,171 @@
+import csv
+import functools
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+COUNTERS = ['rows', 'bytes_read', 'bytes_written', 'cache_hits', 'cache_misses']
+EVENT_COLUMNS = ['started', 'kind', 'name', 'wall_ms'] + COUNTERS
+
+
+class Profiler:
+    # 실행 시간, 읽은 행 수, 읽고 쓴 바이트, 캐시 적중을 최근 capacity건까지 메모리에 보관한다
+    # 꺼져 있을 때는 enabled 확인 한 번만 하고 바로 원래 함수를 실행한다
+    def __init__(self, capacity=5000):
+        self.enabled = os.environ.get('ATTENDANCE_PROFILE') == '1'
+        self.events = deque(maxlen=capacity)
+        self.local = threading.local()
+
+    def stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def start(self, name, kind='method'):
+        if not self.enabled:
+            return None
+        if kind == 'page':
+            # 이전 실행이 중간에 끊겼으면 남은 구간을 버린다 (Streamlit 재실행)
+            self.local.stack = []
+        span = {'name': name, 'kind': kind, 'started': time.time(), 'perf': time.perf_counter()}
+        span.update({counter: 0 for counter in COUNTERS})
+        self.stack().append(span)
+        return span
+
+    def finish(self, span):
+        if span is None:
+            return
+        span['wall_ms'] = (time.perf_counter() - span.pop('perf')) * 1000
+        stack = self.stack()
+        for index, item in enumerate(stack):
+            if item is span:
+                del stack[index:]
+                break
+        # 바깥 구간에도 합산한다
+        if stack:
+            for counter in COUNTERS:
+                stack[-1][counter] += span[counter]
+        self.events.append(span)
+
+    @contextmanager
+    def span(self, name, kind='method'):
+        span = self.start(name, kind)
+        try:
+            yield span
+        finally:
+            self.finish(span)
+
+    def count(self, **amounts):
+        if not self.enabled:
+            return
+        stack = self.stack()
+        if stack:
+            for counter, amount in amounts.items():
+                stack[-1][counter] += amount
+
+    def clear(self):
+        self.events.clear()
+
+    def snapshot(self):
+        return [dict(event) for event in list(self.events)]
+
+    def summary(self):
+        import pandas as pd
+
+        events = pd.DataFrame(self.snapshot(), columns=EVENT_COLUMNS)
+        if len(events) == 0:
+            return events
+        grouped = events.groupby(['kind', 'name'])
+        summary = grouped['wall_ms'].agg(['count', 'mean', 'max'])
+        summary['p95'] = grouped['wall_ms'].quantile(0.95)
+        summary = summary.join(grouped[COUNTERS].sum())
+        lookups = summary['cache_hits'] + summary['cache_misses']
+        summary['cache_hit_rate'] = (summary['cache_hits'] / lookups.where(lookups > 0)).fillna(0)
+        return summary.reset_index().sort_values('mean', ascending=False)
+
+    def export_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def export_csv(self):
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=EVENT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(self.snapshot())
+        return output.getvalue()
+
+
+PROFILER = Profiler()
+
+
+class StartupTimer:
+    # 콜드 스타트 구간별 소요 시간 (계측 설정과 상관없이 구간마다 처음 한 번만 기록한다)
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.created = time.perf_counter()
+        self.stages = {}
+
+    def record(self, stage, seconds):
+        with self.lock:
+            if stage not in self.stages:
+                self.stages[stage] = seconds * 1000
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def since_start(self, stage):
+        # 이 모듈을 처음 불러온 때(첫 실행 시작)부터의 시간
+        self.record(stage, time.perf_counter() - self.created)
+
+    def snapshot(self):
+        with self.lock:
+            return [{'구간': stage, 'ms': ms} for stage, ms in self.stages.items()]
+
+
+STARTUP = StartupTimer()
+
+
+def profiled(name=None, kind='method'):
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with PROFILER.span(label, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def profile_methods(cls):
+    # 클래스의 공개 메서드 전체에 profiled를 적용한다
+    for attr, value in list(vars(cls).items()):
+        if callable(value) and not attr.startswith('_'):
+            setattr(cls, attr, profiled(f'{cls.__name__}.{attr}')(value))
+    return cls
+
+
+class ProfiledModule:
+    # plotly.express처럼 모듈 함수 호출 시간을 재기 위한 얇은 래퍼
+    def __init__(self, module, prefix, kind='chart'):
+        self.module = module
+        self.prefix = prefix
+        self.kind = kind
+
+    def __getattr__(self, attr):
+        value = getattr(self.module, attr)
+        if callable(value):
+            value = profiled(f'{self.prefix}.{attr}', self.kind)(value)
+            setattr(self, attr, value)
+        return value
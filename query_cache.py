@@ -0,0 +1,109 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from profiling import PROFILER
+
+
+def estimate_size(value):
+    # 캐시 용량 계산용 대략적인 바이트 수
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if hasattr(value, 'to_plotly_json'):
+        # plotly Figure는 직렬화한 JSON 크기로 센다
+        return len(value.to_json())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class QueryCache:
+    # (조회 종류, 인자, 데이터 버전)을 키로 집계 결과와 차트를 보관하는 LRU 캐시
+    # 버전은 출석 데이터와 동아리원 목록의 버전이라 어느 쪽이든 쓰기가 있으면 이전 결과는 다시 쓰이지 않는다
+    def __init__(self, sources, max_bytes=64 * 1024 * 1024):
+        self.sources = sources
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.last_version = None
+        self.hits = 0
+        self.misses = 0
+
+    def version(self):
+        return tuple(source.current_version() for source in self.sources)
+
+    def get(self, kind, params, build):
+        version = self.version()
+        key = (kind, tuple(sorted(params.items())), version)
+        with self.lock:
+            if version != self.last_version:
+                self.discard_old(version)
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                PROFILER.count(cache_hits=1)
+                return entry[0]
+            self.misses += 1
+        PROFILER.count(cache_misses=1)
+
+        value = build()
+        size = estimate_size(value)
+        with self.lock:
+            if size <= self.max_bytes and self.version_is_current(version):
+                if key in self.entries:
+                    self.total_bytes -= self.entries.pop(key)[1]
+                self.entries[key] = (value, size)
+                self.total_bytes += size
+                self.evict()
+        return value
+
+    def version_is_current(self, version):
+        # 계산하는 동안 쓰기가 있었으면 저장하지 않는다
+        return self.last_version is None or self.last_version == version
+
+    def discard_old(self, version):
+        for key in [key for key in self.entries if key[2] != version]:
+            self.total_bytes -= self.entries.pop(key)[1]
+        self.last_version = version
+
+    def evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_query_cache(repository, member_registry):
+    key = (id(repository), id(member_registry))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = QueryCache([repository, member_registry])
+            _caches[key] = cache
+        return cache
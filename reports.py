@@ -0,0 +1,282 @@
+import bisect
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from fileutil import atomic_write
+from matrix import STATUS_CODES
+from profiling import PROFILER
+
+REPORTS_FILE = 'report_snapshots.npz'
+# 출석/지각/결석 외의 상태 코드 (0은 기록 없음)
+OTHER_CODE = 4
+# 출석 체크나 수정이 몰릴 때 마지막 변경 후 이만큼 기다렸다가 한 번에 다시 계산한다
+REFRESH_DELAY = 2.0
+FORMAT_VERSION = 1
+
+
+def date_hashes(df):
+    # 날짜별 기록 지문: 행 해시의 합 (행 순서와 무관, 한 행만 바뀌어도 달라진다)
+    if len(df) == 0:
+        return {}
+    rows = pd.util.hash_pandas_object(df[['날짜', '이름', '부서', '출석상태']], index=False).to_numpy()
+    dates = df['날짜'].to_numpy()
+    # frame은 날짜 순으로 정렬되어 있으므로 날짜가 바뀌는 위치에서 나눠 더한다
+    starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    sums = np.add.reduceat(rows, starts)
+    return dict(zip(df['날짜'].iloc[starts].dt.strftime('%Y-%m-%d').tolist(), sums.tolist()))
+
+
+class ReportSnapshots:
+    # 연습일마다 그날까지의 (이름, 부서)별 누적 출석/지각/결석/전체 건수를 저장해 두고
+    # "최종 연습 일자별 통계"를 원본 기록 없이 바로 만든다 (월말 보고서는 그 달 마지막 연습일의 스냅샷)
+    # 파일에는 연습일 × (이름, 부서) 상태 코드만 압축해서 저장하고 누적 건수는 읽을 때 계산한다
+    # 기록이 바뀌면 그 날짜 이후의 스냅샷만 다시 계산한다 (repository의 파생 데이터로 등록되어 쓰기 때 알림을 받음)
+    def __init__(self, repository, path):
+        self.repository = repository
+        self.path = path
+        self.file_lock = threading.Lock()
+        self.dates = []
+        self.pairs = []
+        self.pair_index = {}
+        self.codes = np.zeros((0, 0), dtype=np.int8)
+        self.counts = np.zeros((0, 0, 4), dtype=np.int32)
+        self.hashes = {}
+        # 이 날짜부터의 스냅샷은 다시 계산해야 한다 (None이면 모두 최신, ''이면 전부)
+        self.dirty_from = None
+        self.loaded = False
+        # 파일에 저장된 내용과 같은지
+        self.saved = False
+        # 스냅샷을 다시 계산할 때마다 증가 (저장하는 동안 또 바뀌었는지 확인용)
+        self.generation = 0
+        self.recomputed = 0
+        self.last_refresh = None
+        self.condition = threading.Condition()
+        self.scheduled = None
+        self.thread = None
+
+    def mark_dirty(self, date):
+        if self.dirty_from is None or date < self.dirty_from:
+            self.dirty_from = date
+
+    def add_records(self, records):
+        if records:
+            self.mark_dirty(min(record['날짜'] for record in records))
+            self.schedule()
+
+    def change(self, department, name, date, old_status, new_status):
+        self.mark_dirty(date)
+        self.schedule()
+
+    def load(self):
+        # 저장된 스냅샷 파일을 읽는다 (없거나 읽을 수 없으면 전부 다시 계산)
+        self.loaded = True
+        self.dirty_from = ''
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if int(data['version']) != FORMAT_VERSION:
+                    return
+                dates = data['dates'].tolist()
+                names = data['names'].tolist()
+                departments = data['departments'].tolist()
+                codes = data['codes']
+                hashes = data['hashes'].tolist()
+        except (OSError, KeyError, ValueError):
+            return
+        PROFILER.count(bytes_read=os.path.getsize(self.path))
+        self.dates = dates
+        self.pairs = list(zip(names, departments))
+        self.pair_index = {pair: index for index, pair in enumerate(self.pairs)}
+        self.codes = codes.astype(np.int8)
+        self.counts = np.zeros((len(dates), len(self.pairs), 4), dtype=np.int32)
+        self.accumulate(0)
+        self.hashes = dict(zip(dates, hashes))
+        self.dirty_from = None
+        self.saved = True
+
+    def sync(self, frame):
+        # 출석 기록을 (다시) 읽었을 때 호출된다: 날짜별 지문이 저장된 것과 다른 첫 날짜부터 다시 계산하도록 표시한다
+        if not self.loaded:
+            self.load()
+        current = date_hashes(frame)
+        changed = [date for date in set(current) | set(self.hashes) if current.get(date) != self.hashes.get(date)]
+        if changed:
+            self.mark_dirty(min(changed))
+            self.schedule()
+        return self
+
+    def ensure_pair(self, name, department):
+        index = self.pair_index.get((name, department))
+        if index is None:
+            index = len(self.pairs)
+            self.pairs.append((name, department))
+            self.pair_index[(name, department)] = index
+        return index
+
+    def accumulate(self, start):
+        # start번째 연습일부터 누적 건수를 다시 계산한다
+        codes = self.codes[start:]
+        base = self.counts[start - 1] if start > 0 else np.zeros((codes.shape[1], 4), dtype=np.int32)
+        for column, code in enumerate([1, 2, 3]):
+            self.counts[start:, :, column] = base[:, column] + np.cumsum(codes == code, axis=0)
+        self.counts[start:, :, 3] = base[:, 3] + np.cumsum(codes > 0, axis=0)
+
+    def recompute(self):
+        # dirty_from 이후의 기록만 읽어 그 날짜부터의 스냅샷을 다시 만든다
+        start_date = self.dirty_from
+        part = self.repository.select(start_date=start_date or None)
+        start = bisect.bisect_left(self.dates, start_date)
+        old_pairs = len(self.pairs)
+        if len(part) > 0:
+            date_codes, dates = pd.factorize(part['날짜'], sort=True)
+            dates = dates.strftime('%Y-%m-%d').tolist()
+            # (이름, 부서) 쌍은 범주 코드로 묶어 문자열 변환 없이 찾는다
+            names = part['이름'].cat
+            departments = part['부서'].cat
+            combined = names.codes.to_numpy(np.int64) * len(departments.categories) + departments.codes.to_numpy(np.int64)
+            pairs, pair_codes = np.unique(combined, return_inverse=True)
+            mapping = np.array([
+                self.ensure_pair(str(names.categories[pair // len(departments.categories)]),
+                                 str(departments.categories[pair % len(departments.categories)]))
+                for pair in pairs
+            ], dtype=np.int64)
+            categories = part['출석상태'].cat.categories
+            status_codes = np.array([STATUS_CODES.get(status, OTHER_CODE) for status in categories], dtype=np.int8)
+            statuses = status_codes[part['출석상태'].cat.codes.to_numpy()]
+        else:
+            dates = []
+        codes = np.zeros((start + len(dates), len(self.pairs)), dtype=np.int8)
+        codes[:start, :old_pairs] = self.codes[:start]
+        if dates:
+            codes[start + date_codes, mapping[pair_codes]] = statuses
+        counts = np.zeros((len(codes), len(self.pairs), 4), dtype=np.int32)
+        counts[:start, :old_pairs] = self.counts[:start]
+        self.dates = self.dates[:start] + dates
+        self.codes = codes
+        self.counts = counts
+        self.accumulate(start)
+        self.hashes = {date: value for date, value in self.hashes.items() if date < start_date}
+        self.hashes.update(date_hashes(part))
+        self.recomputed += len(dates)
+        self.generation += 1
+        self.dirty_from = None
+        self.saved = False
+
+    def current(self, until_date=None):
+        # until_date까지의 스냅샷이 최신인지 확인하고, 바뀐 구간에 걸리면 그 구간만 다시 계산한다
+        with self.repository.lock:
+            self.repository.view('report_snapshots', self.sync)
+            if self.dirty_from is not None and (until_date is None or until_date >= self.dirty_from):
+                self.recompute()
+
+    def summary_until_date(self, until_date, names, members, department=None):
+        # until_date까지 names 순서대로 이름별 출석/지각/결석 건수 (department가 있으면 그 부서로 기록된 것만)
+        with self.repository.lock:
+            self.current(until_date)
+            row = bisect.bisect_right(self.dates, until_date) - 1
+            totals = {}
+            if row >= 0:
+                counts = self.counts[row]
+                for index in np.flatnonzero(counts[:, 3]):
+                    name, dept = self.pairs[index]
+                    if department is not None and dept != department:
+                        continue
+                    total = totals.setdefault(name, [0, 0, 0])
+                    for column in range(3):
+                        total[column] += int(counts[index, column])
+        PROFILER.count(rows=len(totals))
+        summary = []
+        for name in names:
+            stats = totals.get(name)
+            if stats:
+                summary.append({
+                    '이름': name,
+                    '부서': members[name],
+                    '출석': stats[0],
+                    '지각': stats[1],
+                    '결석': stats[2]
+                })
+        return summary
+
+    def report_dates(self):
+        # 보고서를 미리 만들어 두는 날짜: 연습일과 월말(그 달 마지막 연습일의 스냅샷)
+        with self.repository.lock:
+            self.current()
+            month_ends = {date[:7]: date for date in self.dates}
+            return {'연습일': list(self.dates), '월말': sorted(month_ends.values())}
+
+    def save(self):
+        # 임시 파일에 쓴 뒤 바꿔치기해서 읽는 쪽이 반쯤 쓴 파일을 보지 않게 한다
+        with self.repository.lock:
+            if self.saved or self.dirty_from is not None:
+                return False
+            dates = list(self.dates)
+            pairs = list(self.pairs)
+            codes = self.codes.copy()
+            hashes = [self.hashes.get(date, 0) for date in dates]
+            generation = self.generation
+        with self.file_lock:
+            atomic_write(self.path, lambda temp_path: np.savez_compressed(
+                temp_path,
+                version=np.array(FORMAT_VERSION),
+                dates=np.array(dates, dtype=str),
+                names=np.array([name for name, _ in pairs], dtype=str),
+                departments=np.array([department for _, department in pairs], dtype=str),
+                codes=codes,
+                hashes=np.array(hashes, dtype=np.uint64),
+            ))
+        with self.repository.lock:
+            # 쓰는 동안 다시 계산했으면 다음 저장 때 새 내용을 쓴다
+            if self.generation == generation:
+                self.saved = True
+        PROFILER.count(bytes_written=os.path.getsize(self.path))
+        return True
+
+    def refresh(self):
+        self.current()
+        self.save()
+        self.last_refresh = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    def schedule(self, delay=REFRESH_DELAY):
+        # 백그라운드 스레드가 delay초 뒤(그 사이 변경이 또 있으면 그만큼 미뤄서) 다시 계산하고 저장한다
+        with self.condition:
+            self.scheduled = time.monotonic() + delay
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.work, name='report-snapshots', daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def work(self):
+        while True:
+            with self.condition:
+                while self.scheduled is None or self.scheduled > time.monotonic():
+                    self.condition.wait(None if self.scheduled is None else self.scheduled - time.monotonic())
+                self.scheduled = None
+            try:
+                self.refresh()
+            except Exception:
+                # 다음 변경 때 다시 시도하고, 그 전에 보고서를 열면 그 자리에서 계산한다
+                pass
+
+    def stats(self):
+        with self.repository.lock:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            return {'dates': len(self.dates), 'pairs': len(self.pairs), 'bytes': size,
+                    'dirty_from': self.dirty_from, 'recomputed': self.recomputed, 'last_refresh': self.last_refresh}
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_report_snapshots(repository, path):
+    key = os.path.abspath(path)
+    with _snapshots_lock:
+        snapshots = _snapshots.get(key)
+        if snapshots is None:
+            snapshots = ReportSnapshots(repository, path)
+            _snapshots[key] = snapshots
+        return snapshots
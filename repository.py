@@ -0,0 +1,207 @@
+import os
+import threading
+
+from aggregation import AttendanceAggregates
+from layout import append_rows, existing_keys, find_row, select, to_public, to_typed
+from matrix import AttendanceMatrix
+from profiling import PROFILER
+from timeseries import AttendanceRollups
+
+
+class AttendanceRepository:
+    # 프로세스 전체에서 공유하는 출석 데이터 캐시
+    # 파일의 mtime/크기 또는 내부 쓰기 버전이 바뀔 때만 다시 읽는다
+    # frame은 날짜 순으로 정렬된 범주형/datetime64 표현이다 (layout.to_typed)
+    def __init__(self, storage):
+        self.storage = storage
+        self.lock = threading.RLock()
+        self.frame = None
+        self.signature = None
+        self.stale = True
+        # 데이터가 바뀔 때마다 증가하는 버전 (다른 캐시의 무효화 기준)
+        self.version = 0
+        # frame을 읽을 때의 저장소 쓰기 순번 (storage.write_sequence)
+        self.sequence = None
+        # 버전별로 캐시하는 파생 데이터: 이름 -> [객체, 버전]
+        # add_records/change가 있는 객체는 쓰기 때 다시 만들지 않고 그 자리에서 갱신한다
+        self.views = {}
+
+    def file_signature(self):
+        signature = []
+        for path in self.storage.watch_paths():
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def reload(self):
+        self.signature = self.file_signature()
+        # 읽기 전에 순번을 잡아 둔다 (사이에 다른 쓰기가 끼면 다음 쓰기 때 어긋나서 다시 읽는다)
+        self.sequence = self.storage.write_sequence()
+        self.frame = to_typed(self.storage.load())
+        self.stale = False
+        self.version += 1
+
+    def get_frame(self):
+        with self.lock:
+            if self.stale or self.frame is None or self.file_signature() != self.signature:
+                PROFILER.count(cache_misses=1)
+                self.reload()
+            else:
+                PROFILER.count(cache_hits=1)
+            return self.frame
+
+    def current_version(self):
+        # 파일이 바뀌었으면 다시 읽은 뒤의 버전
+        with self.lock:
+            self.get_frame()
+            return self.version
+
+    def view(self, key, build):
+        with self.lock:
+            frame = self.get_frame()
+            entry = self.views.get(key)
+            if entry is None or entry[1] != self.version:
+                PROFILER.count(cache_misses=1)
+                entry = [build(frame), self.version]
+                self.views[key] = entry
+            else:
+                PROFILER.count(cache_hits=1)
+            return entry[0]
+
+    def update_views(self, update):
+        # 직전 버전까지 최신이었던 파생 데이터만 새 버전으로 갱신한다
+        for entry in self.views.values():
+            if entry[1] == self.version - 1 and hasattr(entry[0], 'add_records'):
+                update(entry[0])
+                entry[1] = self.version
+
+    def aggregates(self):
+        return self.view('aggregates', AttendanceAggregates)
+
+    def counters(self):
+        return self.view('counters', lambda frame: self.storage.load_counters())
+
+    def matrix(self):
+        return self.view('matrix', AttendanceMatrix.from_frame)
+
+    def rollups(self):
+        return self.view('rollups', AttendanceRollups.from_frame)
+
+    def rebuild_counters(self):
+        with self.lock:
+            self.get_frame()
+            counters = self.storage.rebuild_counters()
+            self.views['counters'] = [counters, self.version]
+            return counters
+
+    def compact(self):
+        with self.lock:
+            compacted = self.storage.compact()
+            # 파일이 바뀌었으므로 다음 조회 때 다시 읽는다
+            self.stale = True
+            return compacted
+
+    def invalidate(self):
+        with self.lock:
+            self.stale = True
+
+    def select(self, date=None, name=None, department=None, start_date=None, end_date=None):
+        # 날짜 범위는 이진 탐색으로 자르고 나머지 조건은 범주 코드로 비교한다
+        with self.lock:
+            part = select(self.get_frame(), date, name, department, start_date, end_date)
+        PROFILER.count(rows=len(part))
+        return part
+
+    def load(self, date=None, name=None, department=None, start_date=None, end_date=None):
+        return to_public(self.select(date, name, department, start_date, end_date))
+
+    def existing_keys(self, keys):
+        with self.lock:
+            return existing_keys(self.get_frame(), keys)
+
+    def track_write(self, changed):
+        # 자기 쓰기 직후 호출: 순번이 바뀐 행 수만큼만 늘었으면 그 사이 다른 프로세스의 쓰기가 없었던 것
+        # 어긋나면 캐시를 버리고 다음 조회 때 다시 읽는다 (순번보다 시그니처를 먼저 잡아야 뒤늦은 커밋을 놓치지 않음)
+        signature = self.file_signature()
+        sequence = self.storage.write_sequence()
+        if sequence != self.sequence + changed:
+            self.stale = True
+            return False
+        self.sequence = sequence
+        self.signature = signature
+        return True
+
+    def insert_records(self, records):
+        # 실제로 새로 기록된 행 목록 (다른 프로세스가 먼저 기록한 (날짜, 이름)은 빠진다)
+        if not records:
+            return []
+        with self.lock:
+            self.get_frame()
+            inserted = self.storage.insert_records(records)
+            if len(inserted) != len(records):
+                # 다른 프로세스가 먼저 기록한 행이 있으면 다시 읽는다
+                self.stale = True
+                return inserted
+            if not self.track_write(len(inserted)):
+                return inserted
+
+            self.frame = append_rows(self.frame, records)
+            self.version += 1
+            self.update_views(lambda view: view.add_records(records))
+            return inserted
+
+    def update_status(self, date, name, status, editor=''):
+        with self.lock:
+            self.get_frame()
+            updated = self.storage.update_status(date, name, status, editor)
+            position = find_row(self.frame, date, name)
+            if updated == 0 and position is None:
+                return 0
+            if updated == 0 or position is None:
+                # 캐시와 파일이 어긋났으므로 다시 읽는다
+                self.stale = True
+                return updated
+            if not self.track_write(int(self.frame['출석상태'].iat[position] != status)):
+                return updated
+            self.apply_status(position, date, name, status)
+            return updated
+
+    def apply_status(self, position, date, name, status):
+        statuses = self.frame['출석상태']
+        if status not in statuses.cat.categories:
+            self.frame['출석상태'] = statuses.cat.add_categories([status])
+        department = self.frame['부서'].iat[position]
+        old_status = self.frame['출석상태'].iat[position]
+        self.frame.iat[position, self.frame.columns.get_loc('출석상태')] = status
+        self.version += 1
+        self.update_views(lambda view: view.change(department, name, date, old_status, status))
+
+    def undo_changes(self, count, editor=''):
+        with self.lock:
+            self.get_frame()
+            undone = self.storage.undo_changes(count, editor)
+            if not self.track_write(len(undone)):
+                return undone
+            for change in undone:
+                position = find_row(self.frame, change['날짜'], change['이름'])
+                if position is None:
+                    self.stale = True
+                    break
+                self.apply_status(position, change['날짜'], change['이름'], change['이전상태'])
+            return undone
+
+_repositories = {}
+_repositories_lock = threading.Lock()
+
+
+def get_repository(storage):
+    key = (type(storage).__name__, os.path.abspath(storage.path))
+    with _repositories_lock:
+        repository = _repositories.get(key)
+        if repository is None:
+            repository = AttendanceRepository(storage)
+            _repositories[key] = repository
+        return repository
@@ -0,0 +1,557 @@
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+
+from counters import AttendanceCounters
+from profiling import PROFILER
+
+COLUMNS = ['날짜', '이름', '부서', '출석상태', '비고']
+
+# 데이터프레임 컬럼과 SQLite 컬럼 매핑
+SQL_COLUMNS = {
+    '날짜': 'date',
+    '이름': 'name',
+    '부서': 'department',
+    '출석상태': 'status',
+    '비고': 'note',
+}
+
+# 상태 변경 기록 컬럼
+CHANGE_COLUMNS = ['번호', '날짜', '이름', '이전상태', '변경상태', '변경시각', '수정자', '되돌린번호']
+
+
+def clean_table_chunk(df):
+    df = df.reindex(columns=COLUMNS)
+    df['비고'] = df['비고'].fillna('')
+    return df.dropna(subset=['날짜', '이름'])
+
+
+def iter_table_file(source, chunk_size=5000, excel=None):
+    # 엑셀/CSV를 chunk_size 행씩 읽는다 (source는 경로 또는 업로드된 파일 객체)
+    if excel is None:
+        excel = not str(getattr(source, 'name', source)).endswith('.csv')
+    if not excel:
+        for chunk in pd.read_csv(source, encoding='utf-8-sig', dtype=str, chunksize=chunk_size):
+            PROFILER.count(rows=len(chunk))
+            yield clean_table_chunk(chunk)
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(value) if value is not None else '' for value in next(rows, [])]
+        batch = []
+        for row in rows:
+            # pd.read_excel(dtype=str)와 같은 문자열로 맞춘다
+            batch.append([None if value is None else str(value) for value in row])
+            if len(batch) >= chunk_size:
+                PROFILER.count(rows=len(batch))
+                yield clean_table_chunk(pd.DataFrame(batch, columns=header[:len(batch[0])]))
+                batch = []
+        if batch:
+            PROFILER.count(rows=len(batch))
+            yield clean_table_chunk(pd.DataFrame(batch, columns=header[:len(batch[0])]))
+    finally:
+        workbook.close()
+
+
+def change_frame(rows):
+    history = pd.DataFrame(rows, columns=CHANGE_COLUMNS)
+    history['되돌린번호'] = history['되돌린번호'].astype('Int64')
+    return history
+
+
+def change_stamp():
+    # 문자열 비교로 시간 순서가 맞도록 고정 폭 형식을 쓴다
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def rewind_frame(df, status_changes, inserted_keys):
+    # 현재 상태에서 기준 시각 이후에 입력된 행은 빼고, 이후에 바뀐 상태는 당시 값으로 되돌린다
+    # status_changes는 기준 시각 이후의 (날짜, 이름, 이전상태)를 오래된 순으로
+    keys = list(zip(df['날짜'], df['이름']))
+    if inserted_keys:
+        keep = [key not in inserted_keys for key in keys]
+        df = df[keep]
+        keys = [key for key, kept in zip(keys, keep) if kept]
+    previous = {}
+    for date, name, old_status in status_changes:
+        previous.setdefault((date, name), old_status)
+    df = df.copy()
+    if previous:
+        df['출석상태'] = [previous.get(key, status) for key, status in zip(keys, df['출석상태'])]
+    return df.reset_index(drop=True)
+
+
+def write_table_file(df, path):
+    if path.endswith('.csv'):
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    else:
+        df.to_excel(path, index=False)
+    if PROFILER.enabled:
+        PROFILER.count(bytes_written=os.path.getsize(path))
+
+
+class StorageBackend:
+    def initialize(self):
+        raise NotImplementedError
+
+    def exists(self):
+        raise NotImplementedError
+
+    def watch_paths(self):
+        # 캐시 무효화를 위해 mtime/크기를 확인할 파일 목록
+        return [self.path]
+
+    def load(self, date=None, name=None, department=None, start_date=None, end_date=None):
+        raise NotImplementedError
+
+    def insert(self, records):
+        return len(self.insert_records(records))
+
+    def insert_records(self, records):
+        # 새로 기록된 행 목록 (이미 있는 (날짜, 이름)은 건너뛴다)
+        raise NotImplementedError
+
+    def write_sequence(self):
+        # 출석 기록 행이 추가/변경될 때마다 그 행 수만큼 늘어나는 값 (다른 프로세스의 쓰기를 알아채는 데 쓴다)
+        raise NotImplementedError
+
+    def update_status(self, date, name, status, editor=''):
+        raise NotImplementedError
+
+    def change_history(self, date=None, name=None, limit=None):
+        raise NotImplementedError
+
+    def undo_changes(self, count, editor=''):
+        # 아직 되돌리지 않은 최근 상태 변경 count개를 최근 것부터 되돌린다 (되돌리기도 변경으로 기록)
+        raise NotImplementedError
+
+    def load_as_of(self, timestamp, date=None):
+        raise NotImplementedError
+
+    def compact(self):
+        return 0
+
+    def load_counters(self):
+        return AttendanceCounters.from_frame(self.load())
+
+    def rebuild_counters(self):
+        return self.load_counters()
+
+    def iter_chunks(self, date=None, name=None, department=None, start_date=None, end_date=None,
+                    chunk_size=5000):
+        df = self.load(date, name, department, start_date, end_date)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+    def import_file(self, path, chunk_size=5000, plan=None):
+        # 청크마다 insert하고, (날짜, 이름) 중복은 저장소의 insert가 걸러낸다 (먼저 나온 행 우선)
+        # plan(청크) -> (기록할 행, {사유: 건수})로 검증하면 걸러진 행은 사유별로 따로 센다
+        read = inserted = 0
+        rejected = {}
+        for chunk in iter_table_file(path, chunk_size):
+            read += len(chunk)
+            if plan is None:
+                records = chunk.to_dict('records')
+            else:
+                records, reasons = plan(chunk)
+                for reason, count in reasons.items():
+                    rejected[reason] = rejected.get(reason, 0) + count
+            inserted += self.insert(records)
+        return read, inserted, rejected
+
+    def export_file(self, path):
+        write_table_file(self.load(), path)
+
+
+# 집계 범위별로 구분하는 컬럼 (나머지 키 컬럼은 빈 문자열)
+COUNTER_SCOPES = {
+    'total': [],
+    'department': ['department'],
+    'member': ['department', 'name'],
+    'date': ['date'],
+}
+COUNTER_KEYS = ['department', 'name', 'date']
+
+
+def counter_values(scope, row=None):
+    values = [f"'{scope}'"]
+    for key in COUNTER_KEYS:
+        if key not in COUNTER_SCOPES[scope]:
+            values.append("''")
+        elif row:
+            values.append(f'{row}.{key}')
+        else:
+            values.append(key)
+    values.append(f'{row}.status' if row else 'status')
+    return ', '.join(values)
+
+
+def counter_updates(row, amount):
+    return ''.join(
+        'INSERT INTO attendance_counters (scope, department, name, date, status, count) '
+        f'VALUES ({counter_values(scope, row)}, {amount}) '
+        'ON CONFLICT (scope, department, name, date, status) '
+        f'DO UPDATE SET count = count + ({amount}); '
+        for scope in COUNTER_SCOPES
+    )
+
+
+class SQLiteStorage(StorageBackend):
+    def __init__(self, path):
+        self.path = path
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def watch_paths(self):
+        # WAL 모드에서는 커밋이 -wal 파일에 먼저 기록된다
+        return [self.path, self.path + '-wal']
+
+    def initialize(self):
+        with closing(self.connect()) as conn, conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS attendance ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'date TEXT NOT NULL, '
+                'name TEXT NOT NULL, '
+                'department TEXT NOT NULL, '
+                'status TEXT NOT NULL, '
+                "note TEXT NOT NULL DEFAULT '', "
+                "created_at TEXT NOT NULL DEFAULT '')"
+            )
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(attendance)')}
+            if 'created_at' not in columns:
+                # 이전 버전 DB: 기존 행은 처음부터 있던 것으로 본다
+                conn.execute("ALTER TABLE attendance ADD COLUMN created_at TEXT NOT NULL DEFAULT ''")
+            # (날짜, 이름)은 중복 출석 방지를 겸하는 유니크 인덱스
+            conn.execute(
+                'CREATE UNIQUE INDEX IF NOT EXISTS idx_attendance_date_name '
+                'ON attendance (date, name)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_attendance_department_date '
+                'ON attendance (department, date)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_attendance_name '
+                'ON attendance (name)'
+            )
+            self.create_counters(conn)
+            self.create_changes(conn)
+            self.create_sequence(conn)
+
+    def create_sequence(self, conn):
+        # 출석 기록 행이 바뀔 때마다 트리거가 같은 트랜잭션 안에서 1씩 올린다 (어느 프로세스가 쓰든)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS attendance_sequence ('
+            'id INTEGER PRIMARY KEY CHECK (id = 0), '
+            'value INTEGER NOT NULL)'
+        )
+        conn.execute('INSERT OR IGNORE INTO attendance_sequence (id, value) VALUES (0, 0)')
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(
+                f'CREATE TRIGGER IF NOT EXISTS attendance_sequence_{event.lower()} '
+                f'AFTER {event} ON attendance BEGIN '
+                'UPDATE attendance_sequence SET value = value + 1 WHERE id = 0; '
+                'END'
+            )
+
+    def write_sequence(self):
+        with closing(self.connect()) as conn:
+            row = conn.execute('SELECT value FROM attendance_sequence WHERE id = 0').fetchone()
+        return row[0] if row else 0
+
+    def create_changes(self, conn):
+        # 상태 변경 이력 (추가만 하고 지우지 않는다)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS attendance_changes ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'date TEXT NOT NULL, '
+            'name TEXT NOT NULL, '
+            'old_status TEXT NOT NULL, '
+            'new_status TEXT NOT NULL, '
+            'changed_at TEXT NOT NULL, '
+            "editor TEXT NOT NULL DEFAULT '', "
+            'reverts INTEGER)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_attendance_changes_record '
+            'ON attendance_changes (date, name)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_attendance_changes_changed_at '
+            'ON attendance_changes (changed_at)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_attendance_changes_reverts '
+            'ON attendance_changes (reverts)'
+        )
+
+    def create_counters(self, conn):
+        # 전체/부서/회원/날짜별 상태 건수를 트리거로 같은 트랜잭션 안에서 갱신한다
+        created = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'attendance_counters'"
+        ).fetchone() is None
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS attendance_counters ('
+            'scope TEXT NOT NULL, '
+            "department TEXT NOT NULL DEFAULT '', "
+            "name TEXT NOT NULL DEFAULT '', "
+            "date TEXT NOT NULL DEFAULT '', "
+            'status TEXT NOT NULL, '
+            'count INTEGER NOT NULL, '
+            'PRIMARY KEY (scope, department, name, date, status))'
+        )
+        conn.execute(
+            'CREATE TRIGGER IF NOT EXISTS attendance_counters_insert '
+            'AFTER INSERT ON attendance BEGIN '
+            + counter_updates('NEW', 1) +
+            'END'
+        )
+        conn.execute(
+            'CREATE TRIGGER IF NOT EXISTS attendance_counters_update '
+            'AFTER UPDATE OF status, department, name, date ON attendance BEGIN '
+            + counter_updates('OLD', -1)
+            + counter_updates('NEW', 1) +
+            'END'
+        )
+        conn.execute(
+            'CREATE TRIGGER IF NOT EXISTS attendance_counters_delete '
+            'AFTER DELETE ON attendance BEGIN '
+            + counter_updates('OLD', -1) +
+            'END'
+        )
+        if created:
+            self.fill_counters(conn)
+
+    def fill_counters(self, conn):
+        conn.execute('DELETE FROM attendance_counters')
+        for scope, keys in COUNTER_SCOPES.items():
+            conn.execute(
+                'INSERT INTO attendance_counters (scope, department, name, date, status, count) '
+                f'SELECT {counter_values(scope)}, COUNT(*) '
+                f"FROM attendance GROUP BY {', '.join(keys + ['status'])}"
+            )
+
+    def compact(self):
+        # WAL에 쌓인 커밋을 본 파일에 합친다
+        with closing(self.connect()) as conn:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return 0
+
+    def rebuild_counters(self):
+        with closing(self.connect()) as conn, conn:
+            self.fill_counters(conn)
+        return self.load_counters()
+
+    def load_counters(self):
+        with closing(self.connect()) as conn:
+            rows = conn.execute(
+                'SELECT scope, department, name, date, status, count '
+                'FROM attendance_counters WHERE count != 0'
+            ).fetchall()
+        PROFILER.count(bytes_read=row_bytes(rows))
+        return AttendanceCounters.from_rows(rows)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def where_clause(self, date=None, name=None, department=None, start_date=None, end_date=None):
+        conditions = []
+        params = []
+        if date is not None:
+            conditions.append('date = ?')
+            params.append(date)
+        if name is not None:
+            conditions.append('name = ?')
+            params.append(name)
+        if department is not None:
+            conditions.append('department = ?')
+            params.append(department)
+        if start_date is not None:
+            conditions.append('date >= ?')
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append('date <= ?')
+            params.append(end_date)
+        where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+        return where, params
+
+    def select_query(self, date=None, name=None, department=None, start_date=None, end_date=None):
+        where, params = self.where_clause(date, name, department, start_date, end_date)
+        query = 'SELECT {} FROM attendance{} ORDER BY id'.format(', '.join(SQL_COLUMNS.values()), where)
+        return query, params
+
+    def load(self, date=None, name=None, department=None, start_date=None, end_date=None):
+        query, params = self.select_query(date, name, department, start_date, end_date)
+        with closing(self.connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        PROFILER.count(rows=len(rows), bytes_read=row_bytes(rows))
+        return pd.DataFrame(rows, columns=COLUMNS)
+
+    def iter_chunks(self, date=None, name=None, department=None, start_date=None, end_date=None,
+                    chunk_size=5000):
+        # 한 커서에서 fetchmany로 나눠 읽는다 (WAL 모드라 읽는 동안 같은 스냅샷을 본다)
+        query, params = self.select_query(date, name, department, start_date, end_date)
+        with closing(self.connect()) as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                PROFILER.count(rows=len(rows), bytes_read=row_bytes(rows))
+                yield pd.DataFrame(rows, columns=COLUMNS)
+
+    def insert(self, records):
+        if not records:
+            return 0
+        stamp = change_stamp()
+        rows = [
+            (r['날짜'], r['이름'], r['부서'], r['출석상태'], r.get('비고') or '', stamp)
+            for r in records
+        ]
+        with closing(self.connect()) as conn, conn:
+            cursor = conn.executemany(
+                'INSERT OR IGNORE INTO attendance (date, name, department, status, note, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            PROFILER.count(rows=len(rows), bytes_written=row_bytes(rows))
+            return cursor.rowcount
+
+    def insert_records(self, records):
+        # 어떤 행이 들어갔는지 알아야 할 때만 쓴다 (한 행씩 실행하므로 insert보다 느리다)
+        if not records:
+            return []
+        stamp = change_stamp()
+        rows = [
+            (r['날짜'], r['이름'], r['부서'], r['출석상태'], r.get('비고') or '', stamp)
+            for r in records
+        ]
+        inserted = []
+        with closing(self.connect()) as conn, conn:
+            for record, row in zip(records, rows):
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO attendance (date, name, department, status, note, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    row
+                )
+                if cursor.rowcount:
+                    inserted.append(record)
+            PROFILER.count(rows=len(rows), bytes_written=row_bytes(rows))
+        return inserted
+
+    def current_status(self, conn, date, name):
+        row = conn.execute(
+            'SELECT status FROM attendance WHERE date = ? AND name = ?', (date, name)
+        ).fetchone()
+        return row[0] if row else None
+
+    def record_status(self, conn, date, name, old_status, status, editor, reverts=None):
+        # 한 칸 UPDATE와 이력 한 줄 추가를 같은 트랜잭션에서 한다
+        change = (date, name, old_status, status, change_stamp(), editor, reverts)
+        conn.execute(
+            'UPDATE attendance SET status = ? WHERE date = ? AND name = ?',
+            (status, date, name)
+        )
+        conn.execute(
+            'INSERT INTO attendance_changes '
+            '(date, name, old_status, new_status, changed_at, editor, reverts) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            change
+        )
+        PROFILER.count(bytes_written=row_bytes([(status,), change]))
+
+    def update_status(self, date, name, status, editor=''):
+        with closing(self.connect()) as conn, conn:
+            conn.execute('BEGIN IMMEDIATE')
+            old_status = self.current_status(conn, date, name)
+            if old_status is None:
+                return 0
+            if old_status != status:
+                self.record_status(conn, date, name, old_status, status, editor)
+            return 1
+
+    def change_history(self, date=None, name=None, limit=None):
+        conditions = []
+        params = []
+        if date is not None:
+            conditions.append('date = ?')
+            params.append(date)
+        if name is not None:
+            conditions.append('name = ?')
+            params.append(name)
+        query = ('SELECT id, date, name, old_status, new_status, changed_at, editor, reverts '
+                 'FROM attendance_changes')
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY id DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        with closing(self.connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        PROFILER.count(bytes_read=row_bytes(rows))
+        return change_frame(rows)
+
+    def undo_changes(self, count, editor=''):
+        undone = []
+        with closing(self.connect()) as conn, conn:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute(
+                'SELECT id, date, name, old_status, new_status FROM attendance_changes AS c '
+                'WHERE reverts IS NULL AND NOT EXISTS '
+                '(SELECT 1 FROM attendance_changes AS u WHERE u.reverts = c.id) '
+                'ORDER BY id DESC LIMIT ?',
+                (count,)
+            ).fetchall()
+            PROFILER.count(bytes_read=row_bytes(rows))
+            for change_id, date, name, old_status, status in rows:
+                if self.current_status(conn, date, name) != status:
+                    # 이력 밖에서 바뀐 기록은 건너뛴다
+                    continue
+                self.record_status(conn, date, name, status, old_status, editor, reverts=change_id)
+                undone.append(dict(zip(CHANGE_COLUMNS, (change_id, date, name, old_status, status))))
+        return undone
+
+    def load_as_of(self, timestamp, date=None):
+        query, params = self.select_query(date=date)
+        with closing(self.connect()) as conn:
+            # 같은 스냅샷에서 현재 상태와 이후 변경을 읽는다
+            conn.execute('BEGIN')
+            rows = conn.execute(query, params).fetchall()
+            status_changes = conn.execute(
+                'SELECT date, name, old_status FROM attendance_changes WHERE changed_at > ? ORDER BY id',
+                (timestamp,)
+            ).fetchall()
+            inserted = set(conn.execute(
+                'SELECT date, name FROM attendance WHERE created_at > ?', (timestamp,)
+            ).fetchall())
+            conn.rollback()
+        PROFILER.count(rows=len(rows), bytes_read=row_bytes(rows) + row_bytes(status_changes) + row_bytes(inserted))
+        return rewind_frame(pd.DataFrame(rows, columns=COLUMNS), status_changes, inserted)
+
+
+def row_bytes(rows):
+    # SQLite는 파일 단위로 읽고 쓰지 않으므로 주고받은 값의 UTF-8 크기로 센다 (프로파일링 중에만 계산)
+    if not PROFILER.enabled:
+        return 0
+    total = 0
+    for row in rows:
+        total += len('\x1f'.join('' if value is None else str(value) for value in row).encode('utf-8'))
+    return total
+
+
+def create_storage(path):
+    # 엑셀/CSV 파일은 가져오기·내보내기 용도로만 쓰고 출석 기록은 SQLite에 둔다
+    return SQLiteStorage(path)
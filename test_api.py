@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+
+from api import ApiError, AttendanceApi, parse_date
+from clubs import get_club_directory, get_system
+
+
+class ParseDateTest(unittest.TestCase):
+    def test_pads_month_and_day(self):
+        self.assertEqual(parse_date('2025-1-5'), '2025-01-05')
+        self.assertEqual(parse_date('2025-01-05'), '2025-01-05')
+
+    def test_rejects_other_formats(self):
+        for value in ['2025/01/05', '05-01-2025', '2025-13-01', 20250105]:
+            with self.assertRaises(ApiError):
+                parse_date(value)
+
+    def test_empty_means_today(self):
+        self.assertIsNone(parse_date(''))
+        self.assertIsNone(parse_date(None))
+
+
+class CheckInTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.temp.name, 'members_list.txt'), 'w', encoding='utf-8') as f:
+            f.write('홍길동,힙합\n김철수,락킹\n')
+        self.api = AttendanceApi(get_club_directory(os.path.join(self.temp.name, 'clubs.json')))
+
+    async def asyncTearDown(self):
+        await self.api.close()
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    async def request(self, method, target, body):
+        return await self.api.dispatch(method, target, json.dumps(body, ensure_ascii=False).encode('utf-8'))
+
+    async def test_unpadded_date_is_stored_padded(self):
+        status, payload = await self.request('POST', '/check-in', {'names': '홍길동', 'date': '2025-1-5'})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['recorded'], ['홍길동'])
+
+        # 같은 날짜를 0을 채워 보내면 이미 있는 기록으로 본다
+        status, payload = await self.request('POST', '/check-in', {'names': '홍길동', 'date': '2025-01-05'})
+        self.assertEqual(payload['recorded'], [])
+
+        status, payload = await self.request('POST', '/modify', {'date': '2025-01-05', 'name': '홍길동', 'status': '지각'})
+        self.assertEqual(status, 200, payload)
+
+        records = get_system(self.api.directory.get()).records.load()
+        self.assertEqual(records[['날짜', '이름', '출석상태']].values.tolist(), [['2025-01-05', '홍길동', '지각']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import bisect
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from aggregation import STATUSES
+
+RESOLUTIONS = ['day', 'week', 'month']
+RESOLUTION_LABELS = {'day': '날짜별', 'week': '주별', 'month': '월별'}
+# 이동 출석률에 쓰는 최근 기간 수
+ROLLING_WINDOWS = {'day': 8, 'week': 4, 'month': 3}
+# 차트 하나에 그릴 최대 점 개수 (이보다 많으면 더 큰 단위로 묶는다)
+MAX_POINTS = 120
+SERIES_COLUMNS = ['기간', '연습횟수'] + STATUSES + ['출석인원', '평균_출석인원', '출석률', '이동_출석률']
+
+
+def period_key(resolution, date):
+    # 날짜가 속한 기간: 일은 날짜, 주는 그 주 월요일, 월은 YYYY-MM
+    if resolution == 'day':
+        return date
+    if resolution == 'month':
+        return date[:7]
+    day = datetime.strptime(date, '%Y-%m-%d')
+    return (day - timedelta(days=day.weekday())).strftime('%Y-%m-%d')
+
+
+def period_span(resolution, key):
+    # 기간의 첫날과 마지막 날 (날짜 문자열과 비교하는 용도라 월은 31일로 둔다)
+    if resolution == 'day':
+        return key, key
+    if resolution == 'month':
+        return key + '-01', key + '-31'
+    monday = datetime.strptime(key, '%Y-%m-%d')
+    return key, (monday + timedelta(days=6)).strftime('%Y-%m-%d')
+
+
+class AttendanceRollups:
+    # 일/주/월 단위로 미리 합산한 (부서, 출석상태) 건수와 연습 횟수
+    # 출석 체크와 상태 수정 때 해당 기간만 갱신한다 (repository의 파생 데이터)
+    def __init__(self):
+        self.counts = {resolution: {} for resolution in RESOLUTIONS}
+        self.practices = {resolution: Counter() for resolution in RESOLUTIONS}
+        # 기간 키 정렬 목록 (범위 조회는 이진 탐색)
+        self.keys = {resolution: [] for resolution in RESOLUTIONS}
+        self.periods = {}
+
+    def period_keys(self, date):
+        keys = self.periods.get(date)
+        if keys is None:
+            keys = {resolution: period_key(resolution, date) for resolution in RESOLUTIONS}
+            self.periods[date] = keys
+        return keys
+
+    def adjust(self, department, date, status, amount):
+        for resolution, key in self.period_keys(date).items():
+            counter = self.counts[resolution].get(key)
+            if counter is None:
+                counter = self.counts[resolution][key] = Counter()
+                bisect.insort(self.keys[resolution], key)
+            counter[(department, status)] += amount
+
+    def add(self, department, date, status, amount=1):
+        # 그 날짜의 첫 기록이면 연습 횟수도 늘린다
+        if date not in self.counts['day']:
+            for resolution, key in self.period_keys(date).items():
+                self.practices[resolution][key] += 1
+        self.adjust(department, date, status, amount)
+
+    def add_records(self, records):
+        for record in records:
+            self.add(record['부서'], record['날짜'], record['출석상태'])
+
+    def change(self, department, name, date, old_status, new_status):
+        if old_status == new_status:
+            return
+        self.adjust(department, date, old_status, -1)
+        self.adjust(department, date, new_status, 1)
+
+    @classmethod
+    def from_frame(cls, df):
+        rollups = cls()
+        if len(df) == 0:
+            return rollups
+        counts = df.groupby(['날짜', '부서', '출석상태'], observed=True).size()
+        for (date, department, status), count in counts.items():
+            if isinstance(date, pd.Timestamp):
+                date = date.strftime('%Y-%m-%d')
+            rollups.add(str(department), date, str(status), int(count))
+        return rollups
+
+    def period_range(self, resolution, start_date=None, end_date=None):
+        keys = self.keys[resolution]
+        lo = 0 if start_date is None else bisect.bisect_left(keys, period_key(resolution, start_date))
+        hi = len(keys) if end_date is None else bisect.bisect_right(keys, period_key(resolution, end_date))
+        return keys[lo:hi]
+
+    def range_counts(self, resolution, key, start_date=None, end_date=None):
+        # 조회 범위에 다 들어가는 기간은 롤업을 그대로 쓰고, 양 끝에 걸친 기간만 일별 값을 합친다
+        first, last = period_span(resolution, key)
+        if (start_date is None or first >= start_date) and (end_date is None or last <= end_date):
+            return self.counts[resolution][key], self.practices[resolution][key]
+        days = self.keys['day']
+        lo = bisect.bisect_left(days, max(first, start_date or first))
+        hi = bisect.bisect_right(days, min(last, end_date or last))
+        counter = Counter()
+        for date in days[lo:hi]:
+            counter.update(self.counts['day'][date])
+        return counter, hi - lo
+
+    def choose_resolution(self, start_date=None, end_date=None, max_points=MAX_POINTS):
+        # 범위 안의 점 개수가 max_points 이하인 가장 촘촘한 단위
+        for resolution in RESOLUTIONS[:-1]:
+            if len(self.period_range(resolution, start_date, end_date)) <= max_points:
+                return resolution
+        return RESOLUTIONS[-1]
+
+    def series(self, resolution=None, start_date=None, end_date=None, department=None, by_department=False,
+               max_points=MAX_POINTS):
+        # 기간별 상태 건수, 연습당 평균 인원, 출석률과 최근 몇 기간의 이동 출석률 -> (표, 단위)
+        resolution = resolution or self.choose_resolution(start_date, end_date, max_points)
+        rows = []
+        for key in self.period_range(resolution, start_date, end_date):
+            counter, practices = self.range_counts(resolution, key, start_date, end_date)
+            groups = {}
+            for (dept, status), count in counter.items():
+                if department is not None and dept != department:
+                    continue
+                group = groups.setdefault(dept if by_department else None, dict.fromkeys(STATUSES, 0))
+                group[status] = group.get(status, 0) + count
+            for dept, counts in sorted(groups.items(), key=lambda item: str(item[0])):
+                total = sum(counts.values())
+                if total <= 0:
+                    continue
+                row = {'기간': key, '연습횟수': practices}
+                if by_department:
+                    row['부서'] = dept
+                row.update({status: counts[status] for status in STATUSES})
+                row['출석인원'] = total
+                row['평균_출석인원'] = total / practices if practices else 0
+                row['출석률'] = counts['출석'] / total * 100
+                rows.append(row)
+
+        columns = SERIES_COLUMNS[:2] + (['부서'] if by_department else []) + SERIES_COLUMNS[2:]
+        table = pd.DataFrame(rows, columns=columns)
+        if len(table) == 0:
+            return table, resolution
+        window = ROLLING_WINDOWS[resolution]
+        if by_department:
+            present = table.groupby('부서')['출석'].transform(lambda s: s.rolling(window, min_periods=1).sum())
+            totals = table.groupby('부서')['출석인원'].transform(lambda s: s.rolling(window, min_periods=1).sum())
+        else:
+            present = table['출석'].rolling(window, min_periods=1).sum()
+            totals = table['출석인원'].rolling(window, min_periods=1).sum()
+        table['이동_출석률'] = present / totals * 100
+        return table, resolution
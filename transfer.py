@@ -0,0 +1,89 @@
+import importlib.util
+import tempfile
+
+from storage import COLUMNS
+
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'text/csv'),
+    'jsonl': ('JSON Lines', 'application/x-ndjson'),
+    'parquet': ('Parquet', 'application/octet-stream'),
+}
+
+
+def available_formats():
+    # Parquet은 pyarrow가 설치된 경우에만 쓴다
+    formats = ['csv', 'jsonl']
+    if importlib.util.find_spec('pyarrow') is not None:
+        formats.append('parquet')
+    return formats
+
+
+def write_csv(chunks, f):
+    # 엑셀에서 한글이 깨지지 않게 BOM을 붙인다
+    f.write(','.join(COLUMNS).encode('utf-8-sig') + b'\n')
+    rows = 0
+    for chunk in chunks:
+        f.write(chunk.to_csv(index=False, header=False, columns=COLUMNS, lineterminator='\n').encode('utf-8'))
+        rows += len(chunk)
+    return rows
+
+
+def write_jsonl(chunks, f):
+    rows = 0
+    for chunk in chunks:
+        if len(chunk):
+            text = chunk[COLUMNS].to_json(orient='records', lines=True, force_ascii=False)
+            f.write(text.rstrip('\n').encode('utf-8') + b'\n')
+        rows += len(chunk)
+    return rows
+
+
+def write_parquet(chunks, f):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column, pa.string()) for column in COLUMNS])
+    rows = 0
+    # 청크마다 row group 하나씩 쓴다
+    with pq.ParquetWriter(f, schema) as writer:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk[COLUMNS].astype(object), schema=schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+    return rows
+
+
+WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'parquet': write_parquet,
+}
+
+
+def export_chunks(chunks, fmt, f):
+    if fmt not in WRITERS:
+        raise ValueError(f'지원하지 않는 형식입니다: {fmt}')
+    return WRITERS[fmt](chunks, f)
+
+
+def export_to_bytes(chunks, fmt, max_memory=1024 * 1024):
+    # 쓰는 동안 큰 결과는 임시 파일로 넘긴다
+    # st.download_button은 파일 객체를 받아도 내용을 통째로 읽어 메모리에 담으므로 완성된 파일은 bytes로 돌려준다
+    with tempfile.SpooledTemporaryFile(max_size=max_memory) as f:
+        export_chunks(chunks, fmt, f)
+        f.seek(0)
+        return f.read()
+
+
+def export_file_name(fmt, date=None, name=None, department=None, start_date=None, end_date=None):
+    parts = ['attendance']
+    if date:
+        parts.append(date)
+    elif start_date or end_date:
+        parts.append(f"{start_date or ''}~{end_date or ''}")
+    if department:
+        parts.append(department)
+    if name:
+        parts.append(name)
+    return '_'.join(parts) + '.' + fmt
+
@@ -0,0 +1,25 @@
+import importlib
+
+from profiling import STARTUP
+
+# 메뉴 이름 -> 페이지 모듈 (선택한 페이지의 모듈만 불러온다)
+PAGES = {
+    "출석 체크": 'check_in',
+    "일괄 출석 입력": 'bulk_entry',
+    "출석 현황 조회": 'summary',
+    "날짜별 출석 조회": 'daily',
+    "연습 진행 현황": 'practice',
+    "출석 예측": 'forecast',
+    "결석 위험 회원": 'at_risk',
+    "동아리원 관리": 'member_admin',
+    "출석 기록 수정": 'edit_records',
+    "데이터 가져오기/내보내기": 'data_transfer',
+    "전체 동아리 현황": 'all_clubs',
+    "성능 모니터링": 'monitoring',
+}
+
+
+def load_page(menu):
+    # 처음 불러올 때 걸린 시간만 기록된다 (이후에는 sys.modules에서 바로 꺼냄)
+    with STARTUP.measure(f"페이지 모듈 로드: {menu}"):
+        return importlib.import_module(f"views.{PAGES[menu]}")
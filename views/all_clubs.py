@@ -0,0 +1,31 @@
+import streamlit as st
+
+from clubs import get_club_directory
+from cross_club import cross_club_statistics
+from views.charts import px
+
+
+def render(context):
+    st.header("전체 동아리 현황")
+    
+    club_table, department_table = cross_club_statistics(context.clubs)
+    st.subheader("동아리별 통계")
+    st.dataframe(club_table)
+    if len(club_table) > 0:
+        fig = px.bar(club_table, x='동아리', y=['출석', '지각', '결석'], barmode='group',
+                     title='동아리별 출석 현황')
+        st.plotly_chart(fig)
+    
+    st.subheader("동아리·부서별 통계")
+    st.dataframe(department_table)
+    
+    with st.expander("동아리 추가"):
+        new_id = st.text_input("동아리 ID (영문, 숫자, -, _)")
+        new_name = st.text_input("동아리 이름")
+        new_departments = st.text_input("부서 목록 (쉼표로 구분)", value=", ".join(context.departments))
+        if st.button("동아리 추가"):
+            success, message = get_club_directory().add(new_id, new_name, new_departments.split(','))
+            if success:
+                st.success(message)
+            else:
+                st.error(message)
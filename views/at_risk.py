@@ -0,0 +1,33 @@
+import streamlit as st
+
+from views.charts import cached_chart, px
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("결석 위험 회원")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        window = st.slider("최근 연습 횟수", min_value=3, max_value=12, value=5)
+    with col2:
+        min_missed = st.slider("결석 기준 (횟수 이상)", min_value=1, max_value=window, value=min(3, window))
+    with col3:
+        dept_option = st.selectbox("부서", ["전체"] + system.departments)
+    top = st.number_input("최대 표시 인원 (0은 전체)", min_value=0, value=20, step=5)
+    
+    at_risk = system.get_at_risk_members(
+        window, min_missed,
+        department=None if dept_option == "전체" else dept_option,
+        top=int(top) or None
+    )
+    if len(at_risk) > 0:
+        st.write(f"최근 {window}회 연습 중 {min_missed}회 이상 빠진 동아리원: {len(at_risk)}명")
+        st.dataframe(at_risk)
+        fig = cached_chart(system, 'at_risk_bar', lambda: px.bar(
+            at_risk, x='이름', y='현재_연속결석', color='부서', title='현재 연속 결석 횟수'),
+            window=window, min_missed=min_missed, department=dept_option, top=int(top))
+        st.plotly_chart(fig)
+    else:
+        st.info("조건에 해당하는 동아리원이 없습니다.")
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import streamlit as st
+
+from ingest import parse_roster, read_roster_file
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("일괄 출석 입력")
+    
+    default_date = st.date_input(
+        "날짜가 없는 행에 사용할 날짜",
+        value=datetime.now(),
+        format="YYYY-MM-DD"
+    )
+    default_status = st.radio("출석상태가 없는 행에 사용할 상태", ["출석", "지각", "결석"])
+    
+    input_type = st.radio("입력 방식을 선택하세요", ["파일 업로드", "명단 붙여넣기"])
+    
+    rows = None
+    if input_type == "파일 업로드":
+        uploaded = st.file_uploader("CSV 또는 엑셀 파일 (날짜, 이름, 출석상태 열)", type=["csv", "xlsx"])
+        if uploaded is not None:
+            rows = read_roster_file(uploaded, default_date.strftime('%Y-%m-%d'), default_status)
+    else:
+        roster = st.text_area("한 줄에 한 명씩 입력하세요",
+                              help="예시: 2025-03-26, 홍길동, 지각 / 김철수, 출석 / 이영희")
+        if roster:
+            rows = parse_roster(roster, default_date.strftime('%Y-%m-%d'), default_status,
+                                members=system.get_members_list())
+    
+    if st.button("일괄 입력"):
+        if rows is None or len(rows) == 0:
+            st.warning("입력할 출석 기록이 없습니다.")
+        else:
+            report = system.bulk_check_attendance(rows)
+            recorded = (report['결과'] == '기록됨').sum()
+            st.success(f"{len(report)}행 중 {recorded}행이 기록되었습니다.")
+            st.dataframe(report)
@@ -0,0 +1,10 @@
+import plotly.express
+
+from profiling import ProfiledModule
+
+px = ProfiledModule(plotly.express, 'plotly')
+
+
+def cached_chart(system, kind, build, **params):
+    # 같은 조회 조건과 데이터 버전이면 만들어 둔 차트를 다시 쓴다
+    return system.cache.get(('chart', kind), params, build)
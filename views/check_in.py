@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import streamlit as st
+
+from feedback import get_feedback_service
+from members import split_names
+
+# 한 번에 여러 명을 체크했을 때 화면에 붙일 최대 음성 수
+MAX_CLIPS = 5
+
+
+def show_feedback(names, status):
+    # 만들어 둔 음성만 재생하고, 아직 없는 음성은 합성을 예약한다 (출석 체크는 합성을 기다리지 않음)
+    service = get_feedback_service()
+    items = [service.feedback(name, status) for name in names]
+    if items[0]['영상']:
+        st.video(items[0]['영상'], autoplay=True)
+    waiting = []
+    for index, item in enumerate(items[:MAX_CLIPS]):
+        if item['음성']:
+            path, mime = item['음성']
+            st.caption(item['문구'])
+            st.audio(path, format=mime, autoplay=index == 0)
+        else:
+            waiting.append(item['이름'])
+    if waiting:
+        st.caption(f"{', '.join(waiting)}님의 확인 음성은 준비 중입니다.")
+
+
+def render(context):
+    st.header("출석 체크")
+    # 이름을 입력하는 동안 출석 기록을 미리 읽어 두어 첫 출석 체크를 기다리지 않게 한다
+    context.warm_up()
+    
+    # 날짜 선택
+    selected_date = st.date_input(
+        "출석 날짜를 선택하세요",
+        value=datetime.now(),
+        format="YYYY-MM-DD"
+    )
+    
+    # 이름 입력
+    names = st.text_input("이름을 입력하세요 (쉼표나 공백으로 구분)", 
+                        help="예시: 홍길동, 김철수 이영희")
+    
+    # 목록에 없는 이름은 보정 결과나 후보를 보여 주고, 고른 후보로 바꿔서 기록한다
+    if names:
+        tokens = split_names(names)
+        corrections = {}
+        for item in context.members.resolve_names(tokens):
+            if item['방식'] == '자동 보정':
+                st.info(f"'{item['입력']}' → {item['이름']} (자동 보정)")
+            elif item['방식'] == '후보':
+                choice = st.selectbox(
+                    f"'{item['입력']}'은(는) 동아리원 목록에 없습니다. 이 중 누구인가요?",
+                    ["선택 안 함"] + item['후보'],
+                    key=f"suggest_{item['입력']}"
+                )
+                if choice != "선택 안 함":
+                    corrections[item['입력']] = choice
+            elif item['방식'] == '없음':
+                st.warning(f"'{item['입력']}'은(는) 동아리원 목록에 없습니다.")
+        names = ' '.join(corrections.get(token, token) for token in tokens)
+    
+    # 출석 상태 선택
+    status = st.radio("출석 상태를 선택하세요", ["출석", "지각", "결석"])
+    
+    play_feedback = st.checkbox("확인 음성/영상 재생", value=True)
+    if play_feedback:
+        # 동아리원 전체의 확인 음성을 백그라운드에서 미리 만든다
+        get_feedback_service().prewarm(context.members.get_members_list())
+    
+    if st.button("출석 체크"):
+        if names:
+            results, recorded = context.get_system().record_attendance(
+                names, 
+                status, 
+                selected_date.strftime('%Y-%m-%d')
+            )
+            st.write("\n".join(results))
+            if play_feedback and recorded:
+                show_feedback(recorded, status)
+        else:
+            st.warning("이름을 입력해주세요.")
@@ -0,0 +1,17 @@
+from clubs import club_entry, get_system, warm_up
+
+
+class PageContext:
+    # 페이지 모듈에 넘기는 현재 동아리 정보
+    # 출석 기록이 필요 없는 페이지는 get_system()을 부르지 않아 pandas를 불러오지 않는다
+    def __init__(self, club, clubs):
+        self.club = club
+        self.clubs = clubs
+        self.departments = club.departments
+        self.members = club_entry(club)['members']
+
+    def get_system(self):
+        return get_system(self.club)
+
+    def warm_up(self):
+        warm_up(self.club)
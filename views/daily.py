@@ -0,0 +1,27 @@
+import streamlit as st
+
+from views.charts import cached_chart, px
+from views.downloads import export_button
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("날짜별 출석 조회")
+    
+    date = st.date_input("조회할 날짜를 선택하세요")
+    if st.button("조회"):
+        df = system.view_attendance(date.strftime('%Y-%m-%d'))
+        if len(df) > 0:
+            st.dataframe(df)
+            
+            # 부서별 출석 현황
+            st.subheader("부서별 출석 현황")
+            fig = cached_chart(system, 'view_pie', lambda: px.pie(
+                df.groupby('부서').size().reset_index(name='출석인원'), values='출석인원', names='부서',
+                title='부서별 출석 인원'), date=date.strftime('%Y-%m-%d'))
+            st.plotly_chart(fig)
+            
+            export_button(system, 'view', date=date.strftime('%Y-%m-%d'))
+        else:
+            st.info("해당 날짜의 출석 기록이 없습니다.")
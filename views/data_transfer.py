@@ -0,0 +1,48 @@
+import os
+
+import streamlit as st
+
+from views.downloads import export_button
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("데이터 가져오기/내보내기")
+    
+    st.subheader("내보내기")
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("시작 날짜", value=None, format="YYYY-MM-DD", key="export_start")
+        department = st.selectbox("부서", ["전체"] + system.departments)
+    with col2:
+        end_date = st.date_input("종료 날짜", value=None, format="YYYY-MM-DD", key="export_end")
+        name = st.text_input("이름 (비워 두면 전체)")
+    
+    export_button(
+        system, 'period',
+        name=name.strip() or None,
+        department=None if department == "전체" else department,
+        start_date=start_date.strftime('%Y-%m-%d') if start_date else None,
+        end_date=end_date.strftime('%Y-%m-%d') if end_date else None,
+    )
+    
+    st.subheader("가져오기")
+    st.write("날짜, 이름, 부서, 출석상태, 비고 열이 있는 파일을 가져옵니다. 이미 있는 (날짜, 이름) 기록은 건너뜁니다.")
+    uploaded = st.file_uploader("CSV 또는 엑셀 파일", type=["csv", "xlsx"], key="import_file")
+    if uploaded is not None and st.button("가져오기"):
+        success, message = system.import_attendance(uploaded)
+        if success:
+            st.success(message)
+        else:
+            st.warning(message)
+    
+    existing = [path for path in system.import_files if os.path.exists(path)]
+    if existing:
+        source = st.selectbox("기존 데이터 파일", existing)
+        if st.button("기존 파일에서 가져오기"):
+            success, message = system.import_attendance(source)
+            if success:
+                st.success(message)
+            else:
+                st.warning(message)
@@ -0,0 +1,18 @@
+import streamlit as st
+
+from transfer import EXPORT_FORMATS, available_formats, export_file_name
+
+
+def export_button(system, key, **filters):
+    # 파일은 버튼을 누를 때 별도 스레드에서 청크 단위로 만든다
+    formats = available_formats()
+    fmt = st.radio("내보내기 형식", formats, format_func=lambda f: EXPORT_FORMATS[f][0],
+                   horizontal=True, key=f"export_format_{key}")
+    st.download_button(
+        "다운로드",
+        data=lambda: system.export_attendance(fmt, **filters),
+        file_name=export_file_name(fmt, **filters),
+        mime=EXPORT_FORMATS[fmt][1],
+        on_click="ignore",
+        key=f"export_download_{key}",
+    )
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import streamlit as st
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("출석 기록 수정")
+    
+    # 날짜 선택
+    selected_date = st.date_input(
+        "수정할 출석 날짜를 선택하세요",
+        value=datetime.now(),
+        format="YYYY-MM-DD"
+    )
+    
+    # 해당 날짜의 출석 기록 가져오기
+    df = system.view_attendance(selected_date.strftime('%Y-%m-%d'))
+    
+    if len(df) > 0:
+        # 이름 선택
+        name = st.selectbox(
+            "수정할 동아리원을 선택하세요",
+            options=df['이름'].unique()
+        )
+        
+        # 현재 출석 상태 표시
+        current_status = df[df['이름'] == name]['출석상태'].iloc[0]
+        st.write(f"현재 출석 상태: {current_status}")
+        
+        # 새로운 출석 상태 선택
+        new_status = st.radio(
+            "새로운 출석 상태를 선택하세요",
+            ["출석", "지각", "결석"]
+        )
+        editor = st.text_input("수정자 (선택)", key="editor")
+        
+        if st.button("출석 상태 수정"):
+            success, message = system.modify_attendance(
+                selected_date.strftime('%Y-%m-%d'),
+                name,
+                new_status,
+                editor.strip()
+            )
+            if success:
+                st.success(message)
+            else:
+                st.error(message)
+        
+        # 선택한 기록의 수정 이력
+        history = system.get_change_history(selected_date.strftime('%Y-%m-%d'), name)
+        if len(history) > 0:
+            st.subheader(f"{name}님의 {selected_date.strftime('%Y-%m-%d')} 수정 이력")
+            st.dataframe(history)
+    else:
+        st.warning(f"{selected_date.strftime('%Y-%m-%d')}에 출석 기록이 없습니다.")
+    
+    st.subheader("최근 수정 기록")
+    recent = system.get_change_history(limit=20)
+    if len(recent) > 0:
+        st.dataframe(recent)
+        undo_count = st.number_input("되돌릴 수정 개수", min_value=1, value=1, step=1)
+        if st.button("최근 수정 되돌리기"):
+            success, message = system.undo_attendance_changes(int(undo_count), st.session_state.get("editor", "").strip())
+            if success:
+                st.success(message)
+            else:
+                st.warning(message)
+    else:
+        st.info("수정 기록이 없습니다.")
+    
+    st.subheader("특정 시점의 출석 기록")
+    col1, col2 = st.columns(2)
+    with col1:
+        as_of_date = st.date_input("기준 날짜", value=datetime.now(), format="YYYY-MM-DD", key="as_of_date")
+    with col2:
+        as_of_time = st.time_input("기준 시각", value="now", key="as_of_time")
+    if st.button("시점 조회"):
+        timestamp = datetime.combine(as_of_date, as_of_time).strftime('%Y-%m-%d %H:%M:%S.%f')
+        snapshot = system.view_attendance_as_of(timestamp, selected_date.strftime('%Y-%m-%d'))
+        st.write(f"{timestamp[:19]} 기준 {selected_date.strftime('%Y-%m-%d')} 출석 기록")
+        st.dataframe(snapshot)
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+import streamlit as st
+
+from views.charts import px
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("출석 예측")
+    
+    target_date = st.date_input("예측할 연습 날짜를 선택하세요", value=datetime.now(), format="YYYY-MM-DD")
+    
+    if st.button("예측"):
+        forecast, headcount = system.predict_attendance(target_date.strftime('%Y-%m-%d'))
+        if len(forecast) > 0:
+            st.subheader("부서별 예상 출석 인원")
+            st.write(f"전체 예상 출석 인원: {headcount['예상인원'].sum():.1f}명")
+            fig = px.bar(headcount, x='부서', y='예상인원', title='부서별 예상 출석 인원')
+            st.plotly_chart(fig)
+            
+            st.subheader("동아리원별 출석 확률")
+            forecast['출석확률'] = forecast['출석확률'] * 100
+            st.dataframe(forecast)
+        else:
+            st.info("등록된 동아리원이 없습니다.")
@@ -0,0 +1,50 @@
+import streamlit as st
+
+
+def render(context):
+    # 동아리원 목록만 다루므로 출석 기록(pandas)은 불러오지 않는다
+    system = context.members
+    
+    st.header("동아리원 관리")
+    
+    submenu = st.radio("관리 메뉴 선택", ["동아리원 목록", "동아리원 추가", "동아리원 삭제"])
+    
+    if submenu == "동아리원 목록":
+        members = system.get_members_list()
+        if members:
+            for dept in system.departments:
+                st.subheader(f"[{dept}]")
+                dept_members = system.get_department_members(dept)
+                if dept_members:
+                    for member in dept_members:
+                        st.write(f"- {member}")
+                else:
+                    st.write("- 없음")
+        else:
+            st.info("등록된 동아리원이 없습니다.")
+    
+    elif submenu == "동아리원 추가":
+        name = st.text_input("추가할 동아리원 이름")
+        department = st.selectbox("부서 선택", system.departments)
+        
+        if st.button("추가"):
+            if name:
+                success, message = system.add_member(name, department)
+                if success:
+                    st.success(message)
+                else:
+                    st.error(message)
+            else:
+                st.warning("이름을 입력해주세요.")
+    
+    else:  # 동아리원 삭제
+        members = system.get_members_list()
+        if members:
+            name = st.selectbox("삭제할 동아리원 선택", list(members.keys()))
+            if st.button("삭제"):
+                if system.remove_member(name):
+                    st.success(f"{name}님이 동아리원 목록에서 삭제되었습니다.")
+                else:
+                    st.error(f"{name}님은 동아리원 목록에 없습니다.")
+        else:
+            st.info("등록된 동아리원이 없습니다.")
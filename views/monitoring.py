@@ -0,0 +1,73 @@
+import pandas as pd
+import streamlit as st
+
+from feedback import get_feedback_service
+from profiling import PROFILER, STARTUP
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("성능 모니터링")
+    
+    PROFILER.enabled = st.checkbox(
+        "계측 켜기",
+        value=PROFILER.enabled,
+        help="기능별 실행 시간, 읽은 행 수, 읽고 쓴 바이트, 캐시 적중을 기록합니다. (모든 세션에 적용)"
+    )
+    
+    summary = PROFILER.summary()
+    if len(summary) > 0:
+        st.subheader("기능별 요약")
+        st.dataframe(summary)
+        
+        st.subheader("최근 기록")
+        st.dataframe(pd.DataFrame(PROFILER.snapshot()[::-1]))
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button("JSON 내보내기", PROFILER.export_json(),
+                               file_name="profile.json", mime="application/json")
+        with col2:
+            st.download_button("CSV 내보내기", PROFILER.export_csv(),
+                               file_name="profile.csv", mime="text/csv")
+        with col3:
+            if st.button("기록 지우기"):
+                PROFILER.clear()
+                st.rerun()
+    else:
+        st.info("기록된 계측 정보가 없습니다. 계측을 켠 뒤 다른 메뉴를 사용해 보세요.")
+    
+    st.subheader("시작 시간")
+    startup = STARTUP.snapshot()
+    if startup:
+        st.dataframe(pd.DataFrame(startup))
+    
+    st.subheader("조회 결과 캐시")
+    cache_stats = system.cache.stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("저장된 결과", f"{cache_stats['entries']}개")
+    col2.metric("사용량", f"{cache_stats['bytes'] / 1024 / 1024:.1f} / {cache_stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    col3.metric("적중", f"{cache_stats['hits']} / {cache_stats['hits'] + cache_stats['misses']}")
+    if st.button("캐시 비우기"):
+        system.cache.clear()
+        st.rerun()
+    
+    st.subheader("보고서 스냅샷")
+    report_stats = system.reports.stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("연습일", f"{report_stats['dates']}일")
+    col2.metric("파일 크기", f"{report_stats['bytes'] / 1024:.1f} KB")
+    col3.metric("다시 계산한 날짜", f"{report_stats['recomputed']}일")
+    if report_stats['dirty_from'] is not None:
+        st.caption(f"{report_stats['dirty_from'] or '처음'}부터의 스냅샷을 다시 계산해야 합니다.")
+    elif report_stats['last_refresh']:
+        st.caption(f"마지막 저장: {report_stats['last_refresh']}")
+    
+    st.subheader("확인 음성 캐시")
+    feedback_stats = get_feedback_service().stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("저장된 음성", f"{feedback_stats['files']}개")
+    col2.metric("사용량", f"{feedback_stats['bytes'] / 1024 / 1024:.1f} / {feedback_stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    col3.metric("합성 대기", f"{feedback_stats['pending']}개")
+    st.caption(f"합성기: {', '.join(feedback_stats['synthesizers'])} (실패 {feedback_stats['failures']}회)")
@@ -0,0 +1,51 @@
+import streamlit as st
+
+from timeseries import RESOLUTION_LABELS
+from views.charts import cached_chart, px
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("연습 진행 현황")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        start_date = st.date_input("시작 날짜")
+    with col2:
+        end_date = st.date_input("종료 날짜")
+    
+    if st.button("조회"):
+        period = {'start_date': start_date.strftime('%Y-%m-%d'), 'end_date': end_date.strftime('%Y-%m-%d')}
+        # 범위가 길면 주/월 단위로 묶고 연습 한 번당 평균 인원을 그린다
+        daily_count, resolution = system.get_attendance_trend(**period)
+        
+        if len(daily_count) > 0:
+            dept_count, _ = system.get_attendance_trend(by_department=True, resolution=resolution, **period)
+            label = RESOLUTION_LABELS[resolution]
+            y = '출석인원' if resolution == 'day' else '평균_출석인원'
+            
+            # 전체 출석 인원 추이
+            st.subheader("전체 출석 인원 추이")
+            fig = cached_chart(system, 'practice_line', lambda: px.line(daily_count, x='기간', y=y,
+                        title=f'{label} 출석 인원 추이'), resolution=resolution, **period)
+            st.plotly_chart(fig)
+            
+            # 부서별 출석 인원 추이
+            st.subheader("부서별 출석 인원 추이")
+            fig = cached_chart(system, 'practice_department_line', lambda: px.line(dept_count, x='기간', y=y, color='부서',
+                        title='부서별 출석 인원 추이'), resolution=resolution, **period)
+            st.plotly_chart(fig)
+            
+            # 통계 정보
+            st.subheader("통계 정보")
+            total_practices = daily_count['연습횟수'].sum()
+            total_attendance = daily_count['출석인원'].sum()
+            avg_attendance = total_attendance / total_practices if total_practices > 0 else 0
+            
+            st.write(f"총 연습 횟수: {total_practices}회")
+            st.write(f"총 출석 인원: {total_attendance}명")
+            st.write(f"평균 출석 인원: {avg_attendance:.1f}명")
+        else:
+            st.info("선택한 기간의 출석 기록이 없습니다.")
@@ -0,0 +1,143 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from timeseries import RESOLUTION_LABELS
+from views.charts import cached_chart, px
+
+
+def render(context):
+    system = context.get_system()
+    
+    st.header("출석 현황 조회")
+    
+    # 조회 방식 선택
+    view_type = st.radio("조회 방식을 선택하세요", ["전체 통계", "개인별 조회", "부서별 조회", "최종 연습 일자별 통계"])
+    
+    if view_type == "전체 통계":
+        if st.button("통계 조회"):
+            stats, error = system.get_total_statistics()
+            if error:
+                st.error(error)
+            else:
+                # 전체 통계
+                st.subheader("전체 출석 통계")
+                total_stats = stats['전체']
+                
+                # 전체 통계 차트
+                total_data = {
+                    '상태': ['출석', '지각', '결석'],
+                    '횟수': [total_stats['출석'], total_stats['지각'], total_stats['결석']]
+                }
+                df_total = pd.DataFrame(total_data)
+                fig = cached_chart(system, 'total_pie', lambda: px.pie(df_total, values='횟수', names='상태', 
+                           title='전체 출석 현황'))
+                st.plotly_chart(fig)
+                
+                # 부서별 통계
+                st.subheader("부서별 출석 통계")
+                dept_stats = stats['부서별']
+                
+                # 부서별 통계 테이블
+                dept_data = []
+                for dept, stat in dept_stats.items():
+                    dept_data.append({
+                        '부서': dept,
+                        '출석': stat['출석'],
+                        '지각': stat['지각'],
+                        '결석': stat['결석']
+                    })
+                df_dept = pd.DataFrame(dept_data)
+                st.dataframe(df_dept)
+                
+                # 부서별 통계 차트
+                fig = cached_chart(system, 'department_bar', lambda: px.bar(df_dept, x='부서', y=['출석', '지각', '결석'],
+                           title='부서별 출석 현황',
+                           barmode='group'))
+                st.plotly_chart(fig)
+                
+                # 날짜별 통계
+                st.subheader("날짜별 출석 통계")
+                date_stats = stats['날짜별']
+                st.dataframe(date_stats)
+                
+                # 날짜별 통계 차트 (기간이 길면 주/월 단위로 묶어서 그린다)
+                trend, resolution = system.get_attendance_trend()
+                label = RESOLUTION_LABELS[resolution]
+                fig = cached_chart(system, 'date_line', lambda: px.line(trend, x='기간', y=['출석', '지각', '결석'],
+                           title=f'{label} 출석 현황'), resolution=resolution)
+                st.plotly_chart(fig)
+                fig = cached_chart(system, 'date_rate_line', lambda: px.line(trend, x='기간', y=['출석률', '이동_출석률'],
+                           title=f'{label} 출석률 추이'), resolution=resolution)
+                st.plotly_chart(fig)
+    
+    elif view_type == "개인별 조회":
+        name = st.text_input("조회할 이름을 입력하세요")
+        if st.button("조회"):
+            if name:
+                summary, error = system.get_attendance_summary(name=name)
+                if error:
+                    st.error(error)
+                else:
+                    st.subheader(f"{summary['이름']}님의 출석 현황")
+                    st.write(f"부서: {summary['부서']}")
+                    st.write(f"총 활동일수: {summary['총_활동일수']}일")
+                    
+                    # 출석 현황 차트
+                    attendance_data = {
+                        '상태': ['출석', '지각', '결석'],
+                        '횟수': [summary['출석'], summary['지각'], summary['결석']]
+                    }
+                    df = pd.DataFrame(attendance_data)
+                    fig = cached_chart(system, 'member_pie', lambda: px.pie(df, values='횟수', names='상태', title='출석 현황'),
+                                       name=name)
+                    st.plotly_chart(fig)
+                    
+                    st.write(f"출석률: {summary['출석률']:.1f}%")
+            else:
+                st.warning("이름을 입력해주세요.")
+    
+    elif view_type == "부서별 조회":
+        department = st.selectbox("부서를 선택하세요", system.departments)
+        if st.button("조회"):
+            summary, error = system.get_attendance_summary(department=department)
+            if error:
+                st.error(error)
+            else:
+                st.subheader(f"{department} 부서 출석 현황")
+                
+                # 부서별 출석 현황 테이블
+                df = pd.DataFrame(summary)
+                st.dataframe(df)
+                
+                # 부서별 출석률 차트
+                fig = cached_chart(system, 'department_rate_bar', lambda: px.bar(df, x='이름', y='출석률', 
+                           title=f'{department} 부서 출석률'), department=department)
+                st.plotly_chart(fig)
+    
+    elif view_type == "최종 연습 일자별 통계":
+        # 월말 보고서는 그 달 마지막 연습일의 스냅샷으로 바로 연다
+        month_ends = system.get_report_dates()['월말'][::-1]
+        report = st.selectbox("월말 보고서", ["직접 선택"] + month_ends,
+                              format_func=lambda date: date if date == "직접 선택" else f"{date[:7]} (마지막 연습 {date})")
+        if report == "직접 선택":
+            until_date = st.date_input("최종 연습 일자를 선택하세요", value=datetime.now(), format="YYYY-MM-DD")
+            until_date = until_date.strftime('%Y-%m-%d')
+        else:
+            until_date = report
+        dept_option = st.selectbox("부서(전체는 선택 안함)", ["전체"] + system.departments)
+        if st.button("통계 조회"):
+            if dept_option == "전체":
+                summary = system.get_summary_until_date(until_date)
+            else:
+                summary = system.get_summary_until_date(until_date, department=dept_option)
+            if summary:
+                df = pd.DataFrame(summary)
+                st.dataframe(df)
+                fig = cached_chart(system, 'until_date_bar',
+                                   lambda: px.bar(df, x='이름', y=['출석', '지각', '결석'], barmode='group', title='최종 연습 일자별 출석 통계'),
+                                   until_date=until_date, department=dept_option)
+                st.plotly_chart(fig)
+            else:
+                st.info("해당 기간에 출석 기록이 없습니다.")